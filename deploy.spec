@@ -18,6 +18,7 @@ a = Analysis(
         'PIL.ImageTk',
         'openpyxl',
         'xlrd',
+        'python_calamine',  # optional fast Excel engine, bundled when installed
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,81 @@
+"""
+Cache de resultados de conversão para o sistema SOLID_STRUCTURE.
+Implementa o princípio Single Responsibility Principle (SRP).
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionCache:
+    """Classe responsável por memorizar resultados (LRU), p.ex. por arquivo de entrada."""
+
+    def __init__(self, max_entries: int = 8):
+        self.logger = logger
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, file_path: str, *parts: str) -> Optional[Tuple]:
+        """
+        Build a cache key from the file identity and extra parameters.
+        The file is identified by (absolute path, mtime, size): no extra read of
+        its contents, and any save of the file changes the key.
+
+        Args:
+            file_path: Path to the input file
+            *parts: Extra values the result depends on (e.g. assembly code)
+
+        Returns:
+            Cache key, or None if the file could not be accessed
+        """
+        try:
+            file_stat = os.stat(file_path)
+        except OSError as e:
+            self.logger.debug(f"Não foi possível acessar '{file_path}': {e}")
+            return None
+        return (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size) + parts
+
+    def get(self, key: Optional[Hashable]) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key (e.g. from make_key)
+
+        Returns:
+            Cached value or None on a miss
+        """
+        if key is None:
+            return None
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Optional[Hashable], value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key (e.g. from make_key)
+            value: Value to store
+        """
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
@@ -5,11 +5,16 @@ Implementa o princípio Single Responsibility Principle (SRP).
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 
 
 class ConversionType(Enum):
-    """Enumeração dos tipos de conversão disponíveis."""
+    """Enumeração dos tipos de conversão disponíveis.
+    
+    O valor de cada membro continua sendo o identificador textual (usado pela GUI
+    e nas mensagens); as informações do tipo ficam em `membro.info`.
+    """
     
     HIERARCHICAL_STRUCTURE = "hierarchical_structure"
     PARTS_REGISTRATION = "parts_registration"
@@ -19,14 +24,14 @@ class ConversionType(Enum):
     ALL_CONVERSIONS = "all_conversions"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversionTypeInfo:
-    """Informações sobre um tipo de conversão."""
+    """Informações sobre um tipo de conversão (imutáveis)."""
     
     type: ConversionType
     name: str
     description: str
-    output_columns: list
+    output_columns: Tuple[str, ...]
     requires_assembly_code: bool
     output_filename_prefix: str
     import_code: Optional[str] = None  # Código do importador no sistema NEO
@@ -38,7 +43,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.HIERARCHICAL_STRUCTURE,
         name="Estrutura Hierárquica",
         description="Gera CSV com relacionamentos pai-filho da estrutura de montagem",
-        output_columns=["EMP", "MTG", "COD", "QTD", "PER"],
+        output_columns=("EMP", "MTG", "COD", "QTD", "PER"),
         requires_assembly_code=True,
         output_filename_prefix="ESTRUTURA",
         import_code=None
@@ -48,7 +53,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.PARTS_REGISTRATION,
         name="Cadastro de Peças e Montagens",
         description="Gera CSV para cadastrar peças e montagens no sistema",
-        output_columns=["Codigo", "Descricao", "Prop3", "Prop4", "Prop107", "Prop108", "Prop16", "Prop3_2", "PropS", "Peso"],
+        output_columns=("Codigo", "Descricao", "Prop3", "Prop4", "Prop107", "Prop108", "Prop16", "Prop3_2", "PropS", "Peso"),
         requires_assembly_code=False,
         output_filename_prefix="CADASTRO_PECAS",
         import_code="1"
@@ -58,7 +63,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.DESCRIPTION_UPDATE,
         name="Atualização de Descrições",
         description="Gera CSV para atualizar descrições dos componentes",
-        output_columns=["Codigo", "Descricao"],
+        output_columns=("Codigo", "Descricao"),
         requires_assembly_code=False,
         output_filename_prefix="ATUALIZACAO_DESCRICOES",
         import_code="7"
@@ -68,7 +73,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.MATERIAL_UPDATE,
         name="Atualização de Matéria Prima",
         description="Gera CSV para atualizar matéria prima de peças fabricadas",
-        output_columns=["Empresa", "Codigo", "CodigoMP", "Peso", "Perda"],
+        output_columns=("Empresa", "Codigo", "CodigoMP", "Peso", "Perda"),
         requires_assembly_code=False,
         output_filename_prefix="ATUALIZACAO_MATERIA_PRIMA",
         import_code=None
@@ -78,7 +83,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.OLZ_VERIFICATION,
         name="Verificação de Peças OLZ",
         description="Verifica se peças OLZ estão cadastradas no sistema",
-        output_columns=["Codigo", "Descricao", "Status", "Observacao"],
+        output_columns=("Codigo", "Descricao", "Status", "Observacao"),
         requires_assembly_code=False,
         output_filename_prefix="VERIFICACAO_OLZ",
         import_code=None
@@ -88,7 +93,7 @@ CONVERSION_TYPES: Dict[ConversionType, ConversionTypeInfo] = {
         type=ConversionType.ALL_CONVERSIONS,
         name="Todas as Conversões",
         description="Executa Cadastro, Descrições, Matéria Prima e depois Verificação OLZ",
-        output_columns=[],
+        output_columns=(),
         requires_assembly_code=False,
         output_filename_prefix="TODAS",
         import_code=None
@@ -106,42 +111,51 @@ def get_conversion_type_info(conversion_type: ConversionType) -> ConversionTypeI
     Returns:
         ConversionTypeInfo com as informações do tipo
     """
-    return CONVERSION_TYPES[conversion_type]
+    # Atributo do próprio membro (ver final do módulo), sem consulta ao dicionário
+    return conversion_type.info
 
 
-def get_all_conversion_types() -> Dict[ConversionType, ConversionTypeInfo]:
+def get_all_conversion_types() -> Mapping[ConversionType, ConversionTypeInfo]:
     """
     Obtém todos os tipos de conversão disponíveis.
     
     Returns:
-        Dicionário com todos os tipos de conversão
+        Visão somente leitura com todos os tipos de conversão
     """
-    return CONVERSION_TYPES.copy()
+    return _READONLY_CONVERSION_TYPES
 
 
-def get_conversion_types_for_gui() -> list:
+def get_conversion_types_for_gui() -> tuple:
     """
     Obtém lista formatada dos tipos de conversão para uso na interface gráfica.
     
     Returns:
-        Lista de tuplas (nome, descrição, tipo)
+        Tupla de tuplas (nome, descrição, tipo), calculada uma única vez
     """
-    # Ordem específica para layout 2 colunas (3 à esquerda, 3 à direita):
-    # Esquerda: Hierárquica, Cadastro, OLZ | Direita: Descrições, Matéria Prima, Todas
-    ordered_types = [
-        ConversionType.HIERARCHICAL_STRUCTURE,
-        ConversionType.PARTS_REGISTRATION,
-        ConversionType.OLZ_VERIFICATION,
-        ConversionType.DESCRIPTION_UPDATE,
-        ConversionType.MATERIAL_UPDATE,
-        ConversionType.ALL_CONVERSIONS,
-    ]
-    return [
-        (
-            CONVERSION_TYPES[t].name,
-            CONVERSION_TYPES[t].description,
-            t
-        )
-        for t in ordered_types
-    ]
+    return _GUI_CONVERSION_TYPES
+
+
+# Ordem específica para layout 2 colunas (3 à esquerda, 3 à direita):
+# Esquerda: Hierárquica, Cadastro, OLZ | Direita: Descrições, Matéria Prima, Todas
+_GUI_ORDERED_TYPES = (
+    ConversionType.HIERARCHICAL_STRUCTURE,
+    ConversionType.PARTS_REGISTRATION,
+    ConversionType.OLZ_VERIFICATION,
+    ConversionType.DESCRIPTION_UPDATE,
+    ConversionType.MATERIAL_UPDATE,
+    ConversionType.ALL_CONVERSIONS,
+)
+
+# CONVERSION_TYPES não muda em tempo de execução: monta a lista da GUI uma vez
+_GUI_CONVERSION_TYPES = tuple(
+    (CONVERSION_TYPES[t].name, CONVERSION_TYPES[t].description, t)
+    for t in _GUI_ORDERED_TYPES
+)
+
+# Visão somente leitura, sem cópia a cada chamada
+_READONLY_CONVERSION_TYPES = MappingProxyType(CONVERSION_TYPES)
 
+# Permite acessar as informações direto no membro do enum (conversion_type.info)
+for _conversion_type, _info in CONVERSION_TYPES.items():
+    _conversion_type.info = _info
+del _conversion_type, _info
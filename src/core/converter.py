@@ -4,7 +4,12 @@ Implementa o princípio Single Responsibility Principle (SRP) e Dependency Inver
 """
 
 import os
+import csv
+import copy
+import bisect
+import importlib
 import shutil
+import dataclasses
 import pandas as pd
 import logging
 import traceback
@@ -16,83 +21,67 @@ from .models import (
 )
 from .validators import ValidationService
 from .data_processor import DataProcessor, CSVGenerator
+from .excel_reader import read_excel_cached
+from .conversion_cache import ConversionCache
 from .conversion_types import ConversionType
-from .converters.parts_registration_converter import PartsRegistrationConverter
-from .converters.description_update_converter import DescriptionUpdateConverter
-from .converters.material_update_converter import MaterialUpdateConverter
-from .converters.olz_verification_converter import OLZVerificationConverter
+
+logger = logging.getLogger(__name__)
 
 
 class ZDetector:
     """Classe responsável por detectar caracteres 'Z' no CSV gerado."""
     
-    def detect_z_in_generated_csv(self, csv_file_path: str) -> dict:
+    def detect_z_in_output_rows(self, output_rows: list) -> dict:
         """
-        Detects if there are any 'Z' characters in column B (MTG) of the generated CSV file.
-        The generated CSV has columns: EMP, MTG, COD, QTD, PER (with header)
+        Detects 'Z' characters in column B (MTG) of the generated CSV, checked on
+        the rows that were just written instead of reading the file back from disk.
         
         Args:
-            csv_file_path: Path to the generated CSV file
+            output_rows: (MTG, COD, QTD) tuples passed to CSVGenerator.save_csv_file
             
         Returns:
             dict: Detection result with count, positions, and details
         """
-        try:
-            # Read the generated CSV file (with header, semicolon separated)
-            df = pd.read_csv(csv_file_path, sep=';', header=0, encoding='utf-8-sig')
-            
-            if df.empty or df.shape[1] < 2:
-                return {
-                    'has_z': False,
-                    'count': 0,
-                    'positions': [],
-                    'details': 'No data or insufficient columns in generated CSV'
-                }
-            
-            # Column B is MTG (index 1) - columns are: 0=EMP, 1=MTG, 2=COD, 3=QTD, 4=PER
-            mtg_column = df.iloc[:, 1].astype(str)  # Column B (index 1) - MTG
-            z_mask = mtg_column.str.contains('Z', case=False, na=False)
-            z_count = z_mask.sum()
-            
-            if z_count > 0:
-                # Get positions and details of rows with 'Z'
-                z_positions = df[z_mask].index.tolist()
-                z_details = []
-                
-                for idx in z_positions:
-                    row = df.iloc[idx]
-                    z_details.append({
-                        'row_index': idx + 2,  # +2 for human-readable row number (header is row 1)
-                        'emp': row.iloc[0],  # EMP
-                        'mtg': row.iloc[1],  # MTG
-                        'cod': row.iloc[2],  # COD
-                        'qtd': row.iloc[3],  # QTD
-                        'per': row.iloc[4]   # PER
-                    })
-                
-                return {
-                    'has_z': True,
-                    'count': z_count,
-                    'positions': z_positions,
-                    'details': f"Found {z_count} entries with 'Z' in column B (MTG) of generated CSV",
-                    'z_entries': z_details
-                }
-            else:
-                return {
-                    'has_z': False,
-                    'count': 0,
-                    'positions': [],
-                    'details': "No 'Z' found in column B (MTG) of generated CSV"
-                }
-                
-        except Exception as e:
+        if not output_rows:
             return {
                 'has_z': False,
                 'count': 0,
                 'positions': [],
-                'details': f"Error reading generated CSV file: {str(e)}"
+                'details': 'No data or insufficient columns in generated CSV'
             }
-
+        
+        # Quantities as stored in the CSV (all float when any of them is)
+        float_quantities = CSVGenerator.has_float_quantities(output_rows)
+        z_positions = []
+        z_details = []
+        for position, (parent_code, child_code, quantity) in enumerate(output_rows):
+            mtg = str(parent_code)
+            if 'Z' in mtg or 'z' in mtg:
+                z_positions.append(position)
+                z_details.append({
+                    'row_index': position + 2,  # +2 for human-readable row number (header is row 1)
+                    'emp': '001',
+                    'mtg': parent_code,
+                    'cod': child_code,
+                    'qtd': float(quantity) if float_quantities else quantity,
+                    'per': 0
+                })
+        
+        if z_positions:
+            z_count = len(z_positions)
+            return {
+                'has_z': True,
+                'count': z_count,
+                'positions': z_positions,
+                'details': f"Found {z_count} entries with 'Z' in column B (MTG) of generated CSV",
+                'z_entries': z_details
+            }
+        return {
+            'has_z': False,
+            'count': 0,
+            'positions': [],
+            'details': "No 'Z' found in column B (MTG) of generated CSV"
+        }
 
 class ReportGenerator:
     """Classe responsável por gerar relatórios de processamento."""
@@ -120,91 +109,127 @@ class ReportGenerator:
             code_for_report = os.path.splitext(os.path.basename(output_file))[0].replace('ESTRUTURA_', '')
             exclusions_report_path = os.path.join(report_directory, f"RELATORIO_REMOVIDOS_{code_for_report}.csv")
             
-            # Create clean report with only what you need
-            comprehensive_records = []
-            
-            # Add header
-            comprehensive_records.append({
-                'MOTIVO': 'Cabeçalho do arquivo XLSX',
-                'LINHA_XLSX': 1,
-                'ITEM': 'Cabeçalho',
-                'QTD': 'N/A',
-                'N° DESENHO': 'ITEM;QTD;N° DESENHO;CODIGO MP20',
-                'CODIGO MP20': 'N/A'
-            })
-            
-            # Add only the actual removed lines (caret)
-            comprehensive_records.extend(exclusion_records)
-            
-            # Add the duplicate lines that were consolidated
-            comprehensive_records.extend(duplicate_records)
+            # Create clean report with only what you need, streamed row by row
+            report_columns = ['MOTIVO', 'LINHA_XLSX', 'ITEM', 'QTD', 'N° DESENHO', 'CODIGO MP20']
             
-            # Add consolidated relationships
-            comprehensive_records.extend(consolidated_relationships)
+            # Clean structure: nothing was removed, so keep only a header placeholder
+            if not (exclusion_records or duplicate_records or consolidated_relationships or consolidated_children):
+                with open(exclusions_report_path, 'w', newline='', encoding='utf-8-sig') as report_file:
+                    report_file.write(';'.join(report_columns) + os.linesep)
+                return
             
-            # Add consolidated children - find children of consolidated assemblies
-            for consolidated in consolidated_children:
-                parent_code = consolidated['parent_code']
-                parent_item = consolidated['parent_item']
-                total_qty = consolidated['total_qty']
-                occurrences = consolidated['occurrences']
+            with open(exclusions_report_path, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as report_file:
+                writer = csv.writer(report_file, delimiter=';', lineterminator=os.linesep)
+                writer.writerow(report_columns)
                 
-                # Find all children of this consolidated parent
-                for level, items in items_by_level.items():
-                    for item, qty, child_code, orig_idx in items:
-                        if item.startswith(parent_item + '.'):
-                            comprehensive_records.append({
-                                'MOTIVO': f'Filho de montagem consolidada (parent qty: {total_qty})',
-                                'LINHA_XLSX': orig_idx + 2,
-                                'ITEM': item,
-                                'QTD': qty,
-                                'N° DESENHO': child_code,
-                                'CODIGO MP20': f'Parent: {parent_code} ({occurrences}x)'
-                            })
-            
-            # Add summary statistics
-            actual_exclusions = len(exclusion_records) + 1  # +1 for header
-            duplicate_count = len(duplicate_records)
-            consolidated_count = len(consolidated_relationships)
-            comprehensive_records.append({
-                'MOTIVO': '=== RESUMO ESTATÍSTICO ===',
-                'LINHA_XLSX': 'N/A',
-                'ITEM': f'Total linhas XLSX (com cabeçalho): {total_original_rows + 1}',
-                'QTD': f'Linhas de dados: {total_original_rows}',
-                'N° DESENHO': f'Linhas CSV geradas: {len(output_rows)}',
-                'CODIGO MP20': f'Removidas: {actual_exclusions} | Duplicatas: {duplicate_count} | Consolidadas: {consolidated_count}'
-            })
-            
-            comprehensive_records.append({
-                'MOTIVO': '=== DETALHAMENTO REMOÇÕES ===',
-                'LINHA_XLSX': 'N/A',
-                'ITEM': f'Ignoradas por "^": {len([r for r in exclusion_records if r["MOTIVO"] == "\'^\' em N° DESENHO"])}',
-                'QTD': f'Sem código válido: {len([r for r in exclusion_records if "inválido ou ausente" in r["MOTIVO"]])}',
-                'N° DESENHO': f'Nível inválido: {len([r for r in exclusion_records if "nível não identificável" in r["MOTIVO"]])}',
-                'CODIGO MP20': f'Válidas processadas: {total_original_rows - len(exclusion_records)}'
-            })
-            
-            # Add detailed math breakdown
-            total_input = total_original_rows + 1  # +1 for header
-            total_excluded = actual_exclusions + duplicate_count
-            total_output = len(output_rows)
-            math_diff = total_input - total_excluded - total_output
-            
-            comprehensive_records.append({
-                'MOTIVO': '=== ANÁLISE MATEMÁTICA ===',
-                'LINHA_XLSX': 'N/A',
-                'ITEM': f'Total entrada: {total_input}',
-                'QTD': f'Total excluídas: {total_excluded}',
-                'N° DESENHO': f'Total saída: {total_output}',
-                'CODIGO MP20': f'Diferença: {math_diff}'
-            })
-            
-            exclusions_df = pd.DataFrame(comprehensive_records, columns=['MOTIVO', 'LINHA_XLSX', 'ITEM', 'QTD', 'N° DESENHO', 'CODIGO MP20'])
-            exclusions_df.to_csv(exclusions_report_path, sep=';', index=False, encoding='utf-8-sig')
+                def add_records(records):
+                    # Missing values (None/NaN) are written as empty fields, as DataFrame.to_csv did
+                    writer.writerows(
+                        ['' if not isinstance(value, str) and pd.isna(value) else value
+                         for value in map(record.get, report_columns)]
+                        for record in records
+                    )
+                
+                # Add header
+                add_records([{
+                    'MOTIVO': 'Cabeçalho do arquivo XLSX',
+                    'LINHA_XLSX': 1,
+                    'ITEM': 'Cabeçalho',
+                    'QTD': 'N/A',
+                    'N° DESENHO': 'ITEM;QTD;N° DESENHO;CODIGO MP20',
+                    'CODIGO MP20': 'N/A'
+                }])
+                
+                # Add only the actual removed lines (caret)
+                add_records(exclusion_records)
+                
+                # Add the duplicate lines that were consolidated
+                add_records(duplicate_records)
+                
+                # Add consolidated relationships
+                add_records(consolidated_relationships)
+                
+                # Add consolidated children - find children of consolidated assemblies
+                if consolidated_children:
+                    # Every item in report order, plus its positions sorted by item text:
+                    # the descendants of "1.2" ("1.2.x", "1.2.x.y", ...) are one contiguous run
+                    all_items = [entry for items in items_by_level.values() for entry in items]
+                    positions_by_item = sorted(range(len(all_items)), key=lambda position: all_items[position][0])
+                    sorted_items = [all_items[position][0] for position in positions_by_item]
+                
+                for consolidated in consolidated_children:
+                    parent_code = consolidated['parent_code']
+                    parent_item = consolidated['parent_item']
+                    total_qty = consolidated['total_qty']
+                    occurrences = consolidated['occurrences']
+                    
+                    # Find all children of this consolidated parent
+                    prefix = parent_item + '.'
+                    start = end = bisect.bisect_left(sorted_items, prefix)
+                    while end < len(sorted_items) and sorted_items[end].startswith(prefix):
+                        end += 1
+                    for position in sorted(positions_by_item[start:end]):
+                        item, qty, child_code, orig_idx = all_items[position]
+                        add_records([{
+                            'MOTIVO': f'Filho de montagem consolidada (parent qty: {total_qty})',
+                            'LINHA_XLSX': orig_idx + 2,
+                            'ITEM': item,
+                            'QTD': qty,
+                            'N° DESENHO': child_code,
+                            'CODIGO MP20': f'Parent: {parent_code} ({occurrences}x)'
+                        }])
+                
+                # Add summary statistics
+                actual_exclusions = len(exclusion_records) + 1  # +1 for header
+                duplicate_count = len(duplicate_records)
+                consolidated_count = len(consolidated_relationships)
+                add_records([{
+                    'MOTIVO': '=== RESUMO ESTATÍSTICO ===',
+                    'LINHA_XLSX': 'N/A',
+                    'ITEM': f'Total linhas XLSX (com cabeçalho): {total_original_rows + 1}',
+                    'QTD': f'Linhas de dados: {total_original_rows}',
+                    'N° DESENHO': f'Linhas CSV geradas: {len(output_rows)}',
+                    'CODIGO MP20': f'Removidas: {actual_exclusions} | Duplicatas: {duplicate_count} | Consolidadas: {consolidated_count}'
+                }])
+                
+                # Count the removal reasons in a single pass
+                caret_count = no_code_count = invalid_level_count = 0
+                for record in exclusion_records:
+                    reason = record['MOTIVO']
+                    if reason == "'^' em N° DESENHO":
+                        caret_count += 1
+                    if 'inválido ou ausente' in reason:
+                        no_code_count += 1
+                    if 'nível não identificável' in reason:
+                        invalid_level_count += 1
+                
+                add_records([{
+                    'MOTIVO': '=== DETALHAMENTO REMOÇÕES ===',
+                    'LINHA_XLSX': 'N/A',
+                    'ITEM': f'Ignoradas por "^": {caret_count}',
+                    'QTD': f'Sem código válido: {no_code_count}',
+                    'N° DESENHO': f'Nível inválido: {invalid_level_count}',
+                    'CODIGO MP20': f'Válidas processadas: {total_original_rows - len(exclusion_records)}'
+                }])
+                
+                # Add detailed math breakdown
+                total_input = total_original_rows + 1  # +1 for header
+                total_excluded = actual_exclusions + duplicate_count
+                total_output = len(output_rows)
+                math_diff = total_input - total_excluded - total_output
+                
+                add_records([{
+                    'MOTIVO': '=== ANÁLISE MATEMÁTICA ===',
+                    'LINHA_XLSX': 'N/A',
+                    'ITEM': f'Total entrada: {total_input}',
+                    'QTD': f'Total excluídas: {total_excluded}',
+                    'N° DESENHO': f'Total saída: {total_output}',
+                    'CODIGO MP20': f'Diferença: {math_diff}'
+                }])
             
         except Exception as e:
             # Non-fatal: proceed without blocking export
-            logging.getLogger(__name__).warning(f"Erro ao gerar relatório de exclusões: {str(e)}")
+            logger.warning(f"Erro ao gerar relatório de exclusões: {str(e)}")
 
 
 class MultiTypeConverter:
@@ -215,20 +240,41 @@ class MultiTypeConverter:
     
     def __init__(self, config: ConversionConfig = None):
         self.config = config or ConversionConfig()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.validator = ValidationService(self.config)
         self.data_processor = DataProcessor()
         self.csv_generator = CSVGenerator()
         self.z_detector = ZDetector()
         self.report_generator = ReportGenerator()
         
-        # Inicializar conversores específicos
-        self.converters = {
-            ConversionType.PARTS_REGISTRATION: PartsRegistrationConverter(),
-            ConversionType.DESCRIPTION_UPDATE: DescriptionUpdateConverter(),
-            ConversionType.MATERIAL_UPDATE: MaterialUpdateConverter(),
-            ConversionType.OLZ_VERIFICATION: OLZVerificationConverter()
+        # Conversores específicos: (módulo, classe), criados no primeiro uso
+        self._converter_factories = {
+            ConversionType.PARTS_REGISTRATION: ('.converters.parts_registration_converter', 'PartsRegistrationConverter'),
+            ConversionType.DESCRIPTION_UPDATE: ('.converters.description_update_converter', 'DescriptionUpdateConverter'),
+            ConversionType.MATERIAL_UPDATE: ('.converters.material_update_converter', 'MaterialUpdateConverter'),
+            ConversionType.OLZ_VERIFICATION: ('.converters.olz_verification_converter', 'OLZVerificationConverter')
         }
+        self._converters = {}
+    
+    def _get_converter(self, conversion_type: ConversionType):
+        """
+        Obtém o conversor específico do tipo, importando e instanciando no primeiro uso.
+        
+        Args:
+            conversion_type: Tipo de conversão
+            
+        Returns:
+            Instância do conversor ou None se o tipo não tiver conversor específico
+        """
+        converter = self._converters.get(conversion_type)
+        if converter is None:
+            factory = self._converter_factories.get(conversion_type)
+            if factory is None:
+                return None
+            module_name, class_name = factory
+            converter_class = getattr(importlib.import_module(module_name, __package__), class_name)
+            converter = self._converters.setdefault(conversion_type, converter_class())
+        return converter
     
     def convert(self, request: ConversionRequest, conversion_type: ConversionType = ConversionType.HIERARCHICAL_STRUCTURE) -> ConversionResult:
         """
@@ -262,7 +308,7 @@ class MultiTypeConverter:
                 return self._convert_hierarchical_structure(request)
             else:
                 # Usar conversor específico
-                converter = self.converters.get(conversion_type)
+                converter = self._get_converter(conversion_type)
                 if not converter:
                     error_msg = f"Conversor não encontrado para tipo: {conversion_type}"
                     self.logger.error(error_msg)
@@ -290,6 +336,10 @@ class MultiTypeConverter:
         return original_converter.convert(request)
 
 
+# Shared by every XLSXToCSVConverter so repeated runs in the same session hit it
+_conversion_cache = ConversionCache()
+
+
 class XLSXToCSVConverter:
     """
     Classe principal de conversão XLSX para CSV (versão original).
@@ -298,12 +348,13 @@ class XLSXToCSVConverter:
     
     def __init__(self, config: ConversionConfig = None):
         self.config = config or ConversionConfig()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.validator = ValidationService(self.config)
         self.data_processor = DataProcessor()
         self.csv_generator = CSVGenerator()
         self.z_detector = ZDetector()
         self.report_generator = ReportGenerator()
+        self.conversion_cache = _conversion_cache
     
     def convert(self, request: ConversionRequest) -> ConversionResult:
         """
@@ -337,37 +388,52 @@ class XLSXToCSVConverter:
             
             root_assembly_code = request.assembly_code.strip()
             
-            # Read the XLSX file
-            try:
-                self.logger.info(f"Lendo arquivo: {request.input_file}")
-                df = pd.read_excel(request.input_file)
-                self.logger.info(f"Arquivo lido com sucesso. Linhas: {len(df)}, Colunas: {len(df.columns)}")
-            except Exception as e:
-                error_msg = f"Erro ao ler arquivo Excel: {str(e)}"
-                self.logger.error(error_msg)
-                return ConversionResult(False, error_msg)
-            
-            # Validate DataFrame structure
-            df_validation = self.validator.dataframe_validator.validate_dataframe_structure(df)
-            if not df_validation.is_valid:
-                error_msg = "Erro de validação da estrutura do arquivo:\n" + "\n".join(df_validation.errors)
-                self.logger.error(error_msg)
-                return ConversionResult(False, error_msg)
-            
-            # Log warnings if any
-            if df_validation.warnings:
-                for warning in df_validation.warnings:
-                    self.logger.warning(f"Estrutura do arquivo: {warning}")
-            
-            self.logger.info("Validações concluídas com sucesso")
-            
-            # Process Excel data
-            items_by_level, item_to_code, exclusion_records, stats = self.data_processor.process_excel_data(df)
-            
-            # Build parent-child relationships
-            output_rows, edge_to_quantity, duplicate_records, consolidated_relationships = self.csv_generator.build_parent_child_relationships(
-                items_by_level, root_assembly_code
-            )
+            # Same (unchanged) file and assembly code: reuse the processed relationships
+            cache_key = self.conversion_cache.make_key(request.input_file, root_assembly_code)
+            cached = self.conversion_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"Reutilizando processamento em cache para: {request.input_file}")
+                # Work on a copy: the cached lists/dicts must not see this run's changes
+                (total_rows, items_by_level, exclusion_records, stats, output_rows,
+                 edge_to_quantity, duplicate_records, consolidated_relationships) = copy.deepcopy(cached)
+            else:
+                # Read the XLSX file
+                try:
+                    self.logger.info(f"Lendo arquivo: {request.input_file}")
+                    df = read_excel_cached(request.input_file)
+                    self.logger.info(f"Arquivo lido com sucesso. Linhas: {len(df)}, Colunas: {len(df.columns)}")
+                except Exception as e:
+                    error_msg = f"Erro ao ler arquivo Excel: {str(e)}"
+                    self.logger.error(error_msg)
+                    return ConversionResult(False, error_msg)
+                
+                # Validate DataFrame structure
+                df_validation = self.validator.dataframe_validator.validate_dataframe_structure(df)
+                if not df_validation.is_valid:
+                    error_msg = "Erro de validação da estrutura do arquivo:\n" + "\n".join(df_validation.errors)
+                    self.logger.error(error_msg)
+                    return ConversionResult(False, error_msg)
+                
+                # Log warnings if any
+                if df_validation.warnings:
+                    for warning in df_validation.warnings:
+                        self.logger.warning(f"Estrutura do arquivo: {warning}")
+                
+                self.logger.info("Validações concluídas com sucesso")
+                
+                # Process Excel data
+                items_by_level, item_to_code, exclusion_records, stats = self.data_processor.process_excel_data(df)
+                
+                # Build parent-child relationships
+                output_rows, edge_to_quantity, duplicate_records, consolidated_relationships = self.csv_generator.build_parent_child_relationships(
+                    items_by_level, root_assembly_code
+                )
+                
+                total_rows = len(df)
+                self.conversion_cache.put(cache_key, (
+                    total_rows, items_by_level, exclusion_records, dataclasses.replace(stats), output_rows,
+                    edge_to_quantity, duplicate_records, consolidated_relationships
+                ))
             
             # Prepare output directory and file
             final_output_file = self._prepare_output_file(request.input_file, request.output_file, root_assembly_code)
@@ -375,13 +441,13 @@ class XLSXToCSVConverter:
             # Save CSV file
             self.csv_generator.save_csv_file(output_rows, final_output_file)
             
-            # Check for "Z" in column B of the generated CSV file
-            z_detection_result = self.z_detector.detect_z_in_generated_csv(final_output_file)
+            # Check for "Z" in column B of the generated CSV file (from the rows just written)
+            z_detection_result = self.z_detector.detect_z_in_output_rows(output_rows)
             
             # Generate comprehensive exclusions report
             self.report_generator.generate_exclusions_report(
                 exclusion_records, duplicate_records, consolidated_relationships, [],
-                items_by_level, final_output_file, len(df), output_rows, root_assembly_code
+                items_by_level, final_output_file, total_rows, output_rows, root_assembly_code
             )
             
             # Update statistics
@@ -397,8 +463,8 @@ class XLSXToCSVConverter:
                 details = (
                     f"Verificação de contagem falhou. Esperado: {expected_csv_rows} linhas no CSV, "
                     f"Gerado: {generated_csv_rows}.\n"
-                    f"Resumo: Linhas XLSX (com cabeçalho): {len(df) + 1}; "
-                    f"Linhas de dados XLSX: {len(df)}; Ignoradas por '^': {stats.excluded_rows}; "
+                    f"Resumo: Linhas XLSX (com cabeçalho): {total_rows + 1}; "
+                    f"Linhas de dados XLSX: {total_rows}; Ignoradas por '^': {stats.excluded_rows}; "
                     f"Válidas esperadas: {expected_csv_rows}."
                 )
                 return ConversionResult(False, details)
@@ -480,11 +546,14 @@ class XLSXToCSVConverter:
             # This preserves the original file for multiple conversions
             input_basename = os.path.basename(input_file)
             copied_input_path = os.path.join(target_dir, input_basename)
-            if os.path.abspath(os.path.dirname(input_file)) != os.path.abspath(target_dir):
+            skip_copy = os.environ.get('SOLID_SKIP_INPUT_COPY') == '1'
+            if not skip_copy and os.path.abspath(os.path.dirname(input_file)) != os.path.abspath(target_dir):
                 try:
-                    if os.path.exists(copied_input_path):
-                        os.remove(copied_input_path)
-                    shutil.copy2(input_file, copied_input_path)
+                    if not self._is_same_input_copy(input_file, copied_input_path):
+                        if os.path.exists(copied_input_path):
+                            os.remove(copied_input_path)
+                        # A real copy (not a link): editing it must not touch the original
+                        shutil.copy2(input_file, copied_input_path)
                 except Exception:
                     pass  # Do not block conversion if copy fails
 
@@ -495,6 +564,29 @@ class XLSXToCSVConverter:
         except Exception:
             return output_file  # Return original if folder creation fails
     
+    def _is_same_input_copy(self, input_file: str, copied_input_path: str) -> bool:
+        """
+        Check whether the copy in the output folder is already up to date:
+        a copy2 from a previous run (same size and modification time). A link
+        to the input itself is not a copy and is replaced.
+        
+        Args:
+            input_file: Path to input file
+            copied_input_path: Path of the copy inside the output folder
+        
+        Returns:
+            True if the existing copy can be kept
+        """
+        try:
+            if os.path.samefile(input_file, copied_input_path):
+                return False
+            input_stat = os.stat(input_file)
+            copy_stat = os.stat(copied_input_path)
+            return (input_stat.st_size == copy_stat.st_size
+                    and input_stat.st_mtime_ns == copy_stat.st_mtime_ns)
+        except OSError:
+            return False
+    
     def _create_success_message(self, output_file: str, generated_csv_rows: int, 
                               stats: ProcessingStats, z_detection_result: dict,
                               exclusion_count: int, duplicate_count: int, 
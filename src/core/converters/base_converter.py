@@ -4,12 +4,18 @@ Implementa o princípio Dependency Inversion Principle (DIP).
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterable, Sequence
+import csv
+import functools
+import os
+import numpy as np
 import pandas as pd
 
 from ..models import ConversionRequest, ConversionResult, ProcessingStats
 from ..data_processor import DataProcessor
 
+# Quebras de linha/tabulações viram espaço e ';' vira ',' numa única passada (str.translate)
+_SANITIZE_TABLE = str.maketrans({'\r': ' ', '\n': ' ', '\t': ' ', ';': ','})
 
 class BaseConverter(ABC):
     """
@@ -49,14 +55,16 @@ class BaseConverter(ABC):
     def process_excel_data(self, df: pd.DataFrame) -> tuple:
         """
         Processa os dados do Excel e retorna informações organizadas.
+        Os conversores não geram relatório de exclusões: os registros por linha
+        excluída não são montados (as estatísticas continuam contando as exclusões).
         
         Args:
             df: DataFrame com dados do Excel
             
         Returns:
-            Tuple com (items_by_level, item_to_code, exclusion_records, stats)
+            Tuple com (items_by_level, item_to_code, exclusion_records (vazio), stats)
         """
-        return self.data_processor.process_excel_data(df)
+        return self.data_processor.process_excel_data(df, collect_exclusions=False)
     
     def create_stats(self, total_rows: int, valid_rows: int, excluded_rows: int) -> ProcessingStats:
         """
@@ -78,4 +86,133 @@ class BaseConverter(ABC):
             consolidated_rows=0,
             generated_relationships=valid_rows
         )
-
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _normalize_header(name: str) -> str:
+        """
+        Normaliza cabeçalho removendo acentos e espaços e colocando em minúsculas.
+        Memorizado: os mesmos cabeçalhos se repetem a cada conversão.
+        
+        Args:
+            name: Nome da coluna
+            
+        Returns:
+            Cabeçalho normalizado (p.ex. 'Descrição' -> 'descricao')
+        """
+        try:
+            import unicodedata
+            nkfd = unicodedata.normalize('NFKD', str(name))
+            no_accents = "".join([c for c in nkfd if not unicodedata.combining(c)])
+            return no_accents.lower().strip().replace(" ", "")
+        except Exception:
+            return str(name).lower().strip().replace(" ", "")
+    
+    def caret_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Marca as linhas cujo N° DESENHO contém '^' (ignoradas pelos conversores),
+        numa única busca vetorizada.
+        
+        Args:
+            df: DataFrame com dados do Excel
+        
+        Returns:
+            Array booleano, uma posição por linha do DataFrame
+        """
+        return self.column_as_text(df['N° DESENHO']).str.contains('^', regex=False).to_numpy(dtype=bool)
+    
+    def first_code_occurrences(self, df: pd.DataFrame) -> List[Tuple[int, str]]:
+        """
+        Converte o N° DESENHO de todas as linhas e mantém a primeira ocorrência
+        de cada código. Linhas com '^' ou sem código válido são ignoradas.
+        
+        Args:
+            df: DataFrame com dados do Excel
+        
+        Returns:
+            Lista de (posição da linha no DataFrame, código), na ordem do arquivo
+        """
+        drawing_numbers = df['N° DESENHO']
+        # Conversão vetorizada da coluna inteira
+        codes = self.data_processor.code_converter.convert_olg_codes(drawing_numbers)
+        # Pular linhas com '^' (já processadas no data_processor)
+        codes = codes.where(~self.caret_mask(df), None)
+        
+        # Deduplicação (primeira ocorrência) na hashtable do pandas
+        keep = codes.notna() & ~codes.duplicated(keep='first')
+        return list(zip(np.flatnonzero(keep.to_numpy()).tolist(), codes[keep].tolist()))
+    
+    @staticmethod
+    def column_as_text(column: pd.Series) -> pd.Series:
+        """
+        Converte uma coluna para texto como str(valor) célula a célula;
+        valores ausentes (None/NaN/NaT) viram string vazia.
+        
+        Args:
+            column: Coluna do DataFrame
+        
+        Returns:
+            Series de strings com o mesmo índice
+        """
+        # astype(object) antes de astype(str): datas viram str(Timestamp), como por célula
+        text = column.astype(object).astype(str)
+        return text.where(column.notna(), '')
+    
+    @staticmethod
+    def _sanitize_field(text: Any) -> str:
+        """
+        Remove quebras de linha e normaliza espaços para evitar quebra no CSV.
+        
+        Args:
+            text: Valor da célula
+        
+        Returns:
+            Texto limpo ('' para None)
+        """
+        try:
+            if text is None:
+                return ""
+            s = str(text).translate(_SANITIZE_TABLE)
+            # Colapsar espaços repetidos numa passada: split(' ') deixa vazios onde havia
+            # espaços seguidos; outros brancos (p.ex. NBSP) no meio do texto são preservados
+            return ' '.join(filter(None, s.split(' '))).strip()
+        except Exception:
+            return str(text) if text is not None else ""
+    
+    @staticmethod
+    def sanitize_text_column(text: pd.Series) -> pd.Series:
+        """
+        Limpa textos para CSV separado por ';' em operações vetorizadas:
+        quebras de linha e tabulações viram espaço, ';' vira ',', espaços
+        repetidos são reduzidos a um e as bordas são aparadas.
+        
+        Args:
+            text: Series de strings (p.ex. de column_as_text)
+        
+        Returns:
+            Series de strings limpas
+        """
+        # Mesma tabela de _sanitize_field: uma passada em vez de duas substituições
+        return (
+            text.str.translate(_SANITIZE_TABLE)
+            .str.replace(r' {2,}', ' ', regex=True)
+            .str.strip()
+        )
+    
+    def write_csv_rows(self, output_file: str, rows: Iterable[Sequence], header: Optional[Sequence[str]] = None,
+                       encoding: str = 'utf-8-sig', errors: str = 'strict') -> None:
+        """
+        Grava linhas (tuplas já na ordem das colunas) em CSV separado por ';'.
+        
+        Args:
+            output_file: Caminho do arquivo de saída
+            rows: Linhas a gravar; os valores são gravados como estão
+            header: Linha de cabeçalho (None/vazio = sem cabeçalho)
+            encoding: Codificação do arquivo
+            errors: Tratamento de erros de codificação
+        """
+        with open(output_file, 'w', encoding=encoding, errors=errors, newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f, delimiter=';', lineterminator=os.linesep)
+            if header:
+                writer.writerow(header)
+            writer.writerows(rows)
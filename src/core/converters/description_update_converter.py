@@ -5,10 +5,14 @@ Baseado na macro "2 - ATUALIZAÇÃO DA DESCRIÇÃO DE TODOS OS COMPONENTES.bas"
 
 import pandas as pd
 import logging
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, List, Any, Tuple
 
 from ..models import ConversionRequest, ConversionResult, ProcessingStats
 from .base_converter import BaseConverter
+from ..excel_reader import read_excel_cached
+
+logger = logging.getLogger(__name__)
 
 
 class DescriptionUpdateConverter(BaseConverter):
@@ -22,31 +26,8 @@ class DescriptionUpdateConverter(BaseConverter):
     
     def __init__(self):
         super().__init__()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         
-    @staticmethod
-    def _normalize_header(name: str) -> str:
-        try:
-            import unicodedata
-            nkfd = unicodedata.normalize('NFKD', str(name))
-            no_accents = "".join([c for c in nkfd if not unicodedata.combining(c)])
-            return no_accents.lower().strip().replace(" ", "")
-        except Exception:
-            return str(name).lower().strip().replace(" ", "")
-    
-    @staticmethod
-    def _sanitize_field(text: str) -> str:
-        try:
-            if text is None:
-                return ""
-            s = str(text).replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
-            s = s.replace(';', ',')
-            while '  ' in s:
-                s = s.replace('  ', ' ')
-            return s.strip()
-        except Exception:
-            return str(text) if text is not None else ""
-    
     def convert(self, request: ConversionRequest) -> ConversionResult:
         """
         Converte para formato de atualização de descrições.
@@ -59,7 +40,7 @@ class DescriptionUpdateConverter(BaseConverter):
         """
         try:
             # Ler arquivo Excel
-            df = pd.read_excel(request.input_file)
+            df = read_excel_cached(request.input_file)
             
             # Processar dados
             items_by_level, item_to_code, exclusion_records, stats = self.process_excel_data(df)
@@ -70,7 +51,7 @@ class DescriptionUpdateConverter(BaseConverter):
             # Salvar arquivo CSV
             output_file = self.get_output_filename(request)
             # Ordenar alfabeticamente pela coluna A (Codigo)
-            description_data.sort(key=lambda r: r.get('Codigo', ''))
+            description_data.sort(key=itemgetter(0))
             self._save_description_csv(description_data, output_file)
             
             # Atualizar estatísticas
@@ -100,7 +81,7 @@ class DescriptionUpdateConverter(BaseConverter):
             self.logger.error(error_msg)
             return ConversionResult(False, error_msg)
     
-    def _generate_description_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> List[Dict]:
+    def _generate_description_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> Tuple[List[Tuple[str, str]], List[str]]:
         """
         Gera dados para atualização de descrições.
         
@@ -110,43 +91,33 @@ class DescriptionUpdateConverter(BaseConverter):
             exclusion_records: Registros excluídos
             
         Returns:
-            Lista de dicionários com dados de descrição
+            Tuple com (lista de tuplas (Codigo, Descricao), avisos)
         """
         description_data = []
         warnings: List[str] = []
-        processed_codes = set()  # Para evitar duplicatas
         
-        for index, row in df.iterrows():
-            drawing_number = row['N° DESENHO']
-            
-            # Pular linhas com '^' (já processadas no data_processor)
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                continue
-            
-            # Converter código
-            code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-            if not code:
-                continue
-            
-            # Evitar duplicatas
-            if code in processed_codes:
-                continue
-            processed_codes.add(code)
+        # Coluna C (Descrição) localizada uma única vez, com fallback por posição,
+        # e limpa de uma vez para todas as linhas
+        normalized_map = {self._normalize_header(col): col for col in df.columns}
+        if 'descricao' in normalized_map:
+            description_column = df[normalized_map['descricao']]
+        elif len(df.columns) > 2:
+            description_column = df.iloc[:, 2]  # coluna C
+        else:
+            description_column = None
+        if description_column is not None:
+            descriptions = self.sanitize_text_column(self.column_as_text(description_column)).tolist()
+        else:
+            descriptions = [""] * len(df)
+        # Métodos de append resolvidos uma única vez, fora do laço
+        add_description = description_data.append
+        add_warning = warnings.append
+        # Primeira linha de cada código válido (sem '^', sem duplicatas)
+        for position, code in self.first_code_occurrences(df):
+            index = df.index[position]
             
-            # Obter descrição da coluna C (Descrição) com fallback por posição
-            description = ""
-            try:
-                normalized_map = {self._normalize_header(col): col for col in df.columns}
-                target_key = 'descricao'
-                if target_key in normalized_map:
-                    value = row[normalized_map[target_key]]
-                    description = str(value) if pd.notna(value) else ""
-                else:
-                    value = row.iloc[2]  # coluna C
-                    description = str(value) if pd.notna(value) else ""
-            except Exception:
-                description = ""
-            description = self._sanitize_field(description)
+            # Descrição da coluna C (Descrição), já limpa
+            description = descriptions[position]
             
             # Incluir códigos Z (OLZ) neste conversor – não filtrar
             
@@ -155,14 +126,10 @@ class DescriptionUpdateConverter(BaseConverter):
             if not validation_result['is_valid']:
                 # Linha humana = índice do DF + 2 (1 = cabeçalho do Excel)
                 human_line = index + 2
-                warnings.append(f"Linha {human_line}: {validation_result['message']} para Código {code}")
+                add_warning(f"Linha {human_line}: {validation_result['message']} para Código {code}")
 
-            # Registro com apenas Código e Descrição
-            description_record = {
-                'Codigo': code,
-                'Descricao': description
-            }
-            description_data.append(description_record)
+            # Registro com apenas Código e Descrição (tupla: menos memória que dict)
+            add_description((code, description))
         
         return description_data, warnings
     
@@ -195,21 +162,16 @@ class DescriptionUpdateConverter(BaseConverter):
             'message': 'OK'
         }
     
-    def _save_description_csv(self, data: List[Dict], output_file: str) -> None:
+    def _save_description_csv(self, data: List[Tuple[str, str]], output_file: str) -> None:
         """
         Salva dados de descrição em arquivo CSV.
         
         Args:
-            data: Lista de dados de descrição
+            data: Lista de tuplas (Codigo, Descricao)
             output_file: Caminho do arquivo de saída
         """
-        if not data:
-            df = pd.DataFrame(columns=['Codigo', 'Descricao'])
-        else:
-            df = pd.DataFrame(data, columns=['Codigo', 'Descricao'])
-        
         # Salvar com ponto e vírgula, sem cabeçalho (UTF-8 com BOM)
-        df.to_csv(output_file, sep=';', index=False, header=False, encoding='utf-8-sig')
+        self.write_csv_rows(output_file, data)
     
     def get_output_filename(self, request: ConversionRequest) -> str:
         """
@@ -3,12 +3,34 @@ Conversor para Atualização de Matéria Prima.
 Baseado na macro "3 - ATUALIZAÇÃO MATÉRIA PRIMA DE PEÇAS FABRICADAS.bas"
 """
 
+import re
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, List, Any, Tuple
 
 from ..models import ConversionRequest, ConversionResult, ProcessingStats
 from .base_converter import BaseConverter
+from ..excel_reader import read_excel_cached
+
+logger = logging.getLogger(__name__)
+
+# Padrões compilados uma única vez (usados a cada linha/conversão)
+_MM_VALUE_PATTERN = re.compile(r"(\d+(?:[\.,]\d+)?)\s*mm", re.IGNORECASE)
+
+
+class _NonDigitDeletionTable(dict):
+    """Tabela para str.translate que apaga tudo que não é dígito (mesmo critério de \\d).
+    Preenchida sob demanda: cada caractere é classificado uma única vez."""
+    
+    def __missing__(self, codepoint: int):
+        value = codepoint if chr(codepoint).isdecimal() else None
+        self[codepoint] = value
+        return value
+
+
+_NON_DIGIT_TABLE = _NonDigitDeletionTable()
 
 
 class MaterialUpdateConverter(BaseConverter):
@@ -25,18 +47,8 @@ class MaterialUpdateConverter(BaseConverter):
     
     def __init__(self):
         super().__init__()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
     
-    @staticmethod
-    def _normalize_header(name: str) -> str:
-        try:
-            import unicodedata
-            nkfd = unicodedata.normalize('NFKD', str(name))
-            no_accents = "".join([c for c in nkfd if not unicodedata.combining(c)])
-            return no_accents.lower().strip().replace(" ", "")
-        except Exception:
-            return str(name).lower().strip().replace(" ", "")
-
     @staticmethod
     def _extract_meters_from_text(text: str) -> str:
         """Extrai o último valor em mm do texto e converte para metros com vírgula e 2 casas.
@@ -44,11 +56,10 @@ class MaterialUpdateConverter(BaseConverter):
         Retorna "1,00" caso não consiga extrair.
         """
         try:
-            import re
             if text is None:
                 return "1,00"
             s = str(text)
-            matches = re.findall(r"(\d+(?:[\.,]\d+)?)\s*mm", s, flags=re.IGNORECASE)
+            matches = _MM_VALUE_PATTERN.findall(s)
             if not matches:
                 return "1,00"
             val_txt = matches[-1].replace(',', '.')
@@ -58,68 +69,27 @@ class MaterialUpdateConverter(BaseConverter):
         except Exception:
             return "1,00"
 
-    def _count_valid_map_rows(self, df: pd.DataFrame) -> int:
-        """Conta linhas do XLSX que têm código de matéria-prima válido (após formatação),
-        considerando as mesmas regras de filtragem da conversão (ignora peças OLZ/Z*)."""
-        count = 0
-        processed_codes = set()  # Para evitar duplicatas (mesma lógica da geração)
-        try:
-            for _, row in df.iterrows():
-                drawing_number = row['N° DESENHO']
-                
-                # Pular linhas com '^' (já processadas no data_processor)
-                if pd.notna(drawing_number) and '^' in str(drawing_number):
-                    continue
-                    
-                code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-                if not code or code.startswith('Z'):
-                    continue
-                
-                # Evitar duplicatas (mesma lógica da geração)
-                if code in processed_codes:
-                    continue
-                processed_codes.add(code)
-                
-                raw = str(row['CODIGO MP20']) if pd.notna(row['CODIGO MP20']) else ""
-                formatted = self._format_material_code(raw)
-                if formatted:
-                    count += 1
-        except Exception:
-            pass
-        return count
-    
     @staticmethod
-    def _format_material_code(raw: str) -> str:
-        """Formata o código da matéria-prima para um dos 3 padrões aceitos:
+    def _format_material_codes(raw: pd.Series) -> pd.Series:
+        """Formata os códigos de matéria-prima para um dos 3 padrões aceitos:
         1) 6 dígitos numéricos (ex.: 123456)
         2) 'Z' + 5 dígitos (ex.: Z12345)
         3) 'Z' + 6 dígitos (ex.: Z123456)
-        Caso não seja possível, retorna string vazia.
+        Opera na coluna inteira (texto, p.ex. de column_as_text); onde não for
+        possível formatar, retorna string vazia.
         """
-        try:
-            import re
-            if raw is None:
-                return ""
-            s = str(raw).strip().upper()
-            # Novo método: cortar a partir do primeiro " - " se existir
-            if ' - ' in s:
-                s = s.split(' - ', 1)[0].strip()
-            if not s:
-                return ""
-            if s.startswith('Z'):
-                digits = ''.join(re.findall(r'\d', s))
-                if len(digits) >= 6:
-                    return 'Z' + digits[-6:]
-                if len(digits) >= 5:
-                    return 'Z' + digits[-5:]
-                return ''
-            else:
-                digits = ''.join(re.findall(r'\d', s))
-                if len(digits) >= 6:
-                    return digits[-6:]
-                return ''
-        except Exception:
-            return ""
+        s = raw.str.strip().str.upper()
+        # Novo método: cortar a partir do primeiro " - " se existir
+        s = s.str.split(' - ', n=1).str[0].str.strip()
+        digits = s.str.translate(_NON_DIGIT_TABLE)
+        digit_count = digits.str.len().to_numpy()
+        starts_with_z = s.str.startswith('Z').to_numpy(dtype=bool)
+        formatted = np.select(
+            [starts_with_z & (digit_count >= 6), starts_with_z & (digit_count >= 5), ~starts_with_z & (digit_count >= 6)],
+            [('Z' + digits.str[-6:]).to_numpy(), ('Z' + digits.str[-5:]).to_numpy(), digits.str[-6:].to_numpy()],
+            default=''
+        )
+        return pd.Series(formatted, index=raw.index, dtype=object)
     
     def convert(self, request: ConversionRequest) -> ConversionResult:
         """
@@ -133,16 +103,15 @@ class MaterialUpdateConverter(BaseConverter):
         """
         try:
             # Ler arquivo Excel
-            df = pd.read_excel(request.input_file)
+            df = read_excel_cached(request.input_file)
             
             # Processar dados
             items_by_level, item_to_code, exclusion_records, stats = self.process_excel_data(df)
             
-            # Gerar dados de atualização de matéria prima + avisos
-            material_data, warnings_list = self._generate_material_data(df, item_to_code, exclusion_records)
+            # Gerar dados de atualização de matéria prima + avisos + contagem de linhas com MAP válido
+            material_data, warnings_list, expected_count = self._generate_material_data(df, item_to_code, exclusion_records)
 
             # Verificação: quantidade gerada deve igualar quantidade de linhas com MAP válido
-            expected_count = self._count_valid_map_rows(df)
             generated_count = len(material_data)
             if expected_count != generated_count:
                 warnings_list.append(
@@ -152,7 +121,7 @@ class MaterialUpdateConverter(BaseConverter):
             # Salvar arquivo CSV
             output_file = self.get_output_filename(request)
             # Ordenar alfabeticamente pela coluna B (COD)
-            material_data.sort(key=lambda r: r.get('COD', ''))
+            material_data.sort(key=itemgetter(0))
             self._save_material_csv(material_data, output_file)
             
             # Atualizar estatísticas
@@ -187,7 +156,7 @@ class MaterialUpdateConverter(BaseConverter):
             self.logger.error(error_msg)
             return ConversionResult(False, error_msg)
     
-    def _generate_material_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> List[Dict]:
+    def _generate_material_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> Tuple[List[Tuple[str, str, str]], List[str], int]:
         """
         Gera dados para atualização de matéria prima.
         
@@ -197,67 +166,69 @@ class MaterialUpdateConverter(BaseConverter):
             exclusion_records: Registros excluídos
             
         Returns:
-            Lista de dicionários com dados de matéria prima
+            Tuple com (lista de tuplas (COD, MAP, PES), avisos,
+            quantidade de linhas com MAP válido após filtragem e deduplicação)
         """
         material_data = []
         warnings: List[str] = []
-        processed_codes = set()  # Para evitar duplicatas
+        valid_map_count = 0  # Linhas com MAP válido, contadas antes do cálculo de PES
         
-        for index, row in df.iterrows():
-            drawing_number = row['N° DESENHO']
-            
-            # Pular linhas com '^' (já processadas no data_processor)
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                continue
-            
-            # Converter código
-            code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-            if not code:
-                continue
+        # Colunas extraídas uma única vez e lidas por posição (sem iterrows/itertuples)
+        # Códigos de matéria prima (CODIGO MP20) como texto e já formatados, para todas as linhas
+        material_texts = self.column_as_text(df['CODIGO MP20'])
+        material_codes = self._format_material_codes(material_texts)
+        # MAP de mangueira (Z20): decidido para a coluna inteira de uma vez
+        hose_mask = material_codes.str.startswith('Z20').to_numpy(dtype=bool)
+        material_codes = material_codes.tolist()
+        material_texts = material_texts.tolist()
+        # Colunas de descrição e PESO localizadas uma única vez (o cabeçalho não muda entre linhas)
+        normalized_map = {self._normalize_header(col): col for col in df.columns}
+        description_col = next(
+            (normalized_map[key] for key in ('descricao', 'descrição', 'desc') if key in normalized_map), None
+        )
+        if description_col is not None:
+            description_values = df[description_col].tolist()
+        elif len(df.columns) > 2:
+            description_values = df.iloc[:, 2].tolist()  # Fallback por posição (coluna C = índice 2)
+        else:
+            description_values = None
+        weight_values = df[normalized_map['peso']].tolist() if 'peso' in normalized_map else None
+        # Métodos de append resolvidos uma única vez, fora do laço
+        add_material = material_data.append
+        add_warning = warnings.append
+        # Primeira linha de cada código válido (sem '^', sem duplicatas)
+        for position, code in self.first_code_occurrences(df):
             # Ignorar todos os códigos OLZ (iniciados por 'Z')
             if code.startswith('Z'):
                 continue
-            
-            # Evitar duplicatas
-            if code in processed_codes:
-                continue
-            processed_codes.add(code)
+            index = df.index[position]
             
             # Obter código de matéria prima (usar CODIGO MP20) e aplicar formatação exigida
-            material_code_raw = str(row['CODIGO MP20']) if pd.notna(row['CODIGO MP20']) else ""
-            material_code = self._format_material_code(material_code_raw)
+            material_code_raw = material_texts[position]
+            material_code = material_codes[position]
             
             if not material_code:
                 # Sem código de matéria-prima: não é relevante para este conversor
                 # (ex.: itens que não são peças com MAP). Ignorar silenciosamente.
                 continue
+            valid_map_count += 1
             
             # Calcular PES: se MAP começa com Z20 (mangueira), usar metragem extraída do texto.
             # Caso contrário, tentar coluna PESO; se não houver, usar regra antiga.
             try:
-                if material_code.startswith('Z20'):
+                if hose_mask[position]:
                     # Para mangueiras: extrair SEMPRE a metragem a partir da coluna C (Descrição)
-                    try:
-                        normalized_map_desc = {self._normalize_header(col): col for col in df.columns}
-                        if 'descricao' in normalized_map_desc:
-                            desc_text = row[normalized_map_desc['descricao']]
-                        elif 'descrição' in normalized_map_desc:
-                            desc_text = row[normalized_map_desc['descrição']]
-                        elif 'desc' in normalized_map_desc:
-                            desc_text = row[normalized_map_desc['desc']]
-                        else:
-                            # Fallback por posição (coluna C = índice 2)
-                            desc_text = row.iloc[2]
-                    except Exception:
+                    if description_values is not None:
+                        desc_text = description_values[position]
+                    else:
                         desc_text = material_code_raw
                     weight_or_length = self._extract_meters_from_text(desc_text)
                     if weight_or_length == "1,00":
-                        warnings.append(f"Linha {index+2}: Metragem não encontrada para mangueira (Z20) código {code}")
+                        add_warning(f"Linha {index+2}: Metragem não encontrada para mangueira (Z20) código {code}")
                 else:
-                    normalized_map = {self._normalize_header(col): col for col in df.columns}
                     weight_or_length = "0,00"
-                    if 'peso' in normalized_map:
-                        raw_weight = row[normalized_map['peso']]
+                    if weight_values is not None:
+                        raw_weight = weight_values[position]
                         if pd.notna(raw_weight):
                             txt = str(raw_weight).strip().replace('\u00A0', ' ').replace(' ', '')
                             txt = txt.replace(',', '.')
@@ -265,23 +236,15 @@ class MaterialUpdateConverter(BaseConverter):
                             weight_or_length = f"{val:.2f}".replace('.', ',')
                     else:
                         weight_or_length = self._calculate_weight_or_length(code, material_code)
-                        warnings.append(f"Linha {index+2}: Coluna PESO ausente, usando valor padrão para código {code}")
+                        add_warning(f"Linha {index+2}: Coluna PESO ausente, usando valor padrão para código {code}")
             except Exception:
                 weight_or_length = self._calculate_weight_or_length(code, material_code)
-                warnings.append(f"Linha {index+2}: Erro ao calcular PES para código {code}, usando padrão")
+                add_warning(f"Linha {index+2}: Erro ao calcular PES para código {code}, usando padrão")
             
-            # Criar registro de matéria prima
-            material_record = {
-                'EMP': '001',
-                'COD': code,
-                'MAP': material_code,
-                'PES': weight_or_length,
-                'PER': '0'
-            }
-            
-            material_data.append(material_record)
+            # Criar registro de matéria prima (EMP e PER são constantes, gravados no CSV)
+            add_material((code, material_code, weight_or_length))
         
-        return material_data, warnings
+        return material_data, warnings, valid_map_count
     
     def _calculate_weight_or_length(self, code: str, material_code: str) -> str:
         """
@@ -320,22 +283,18 @@ class MaterialUpdateConverter(BaseConverter):
             # Por enquanto, usar valor padrão
             return "0,50"
     
-    def _save_material_csv(self, data: List[Dict], output_file: str) -> None:
+    def _save_material_csv(self, data: List[Tuple[str, str, str]], output_file: str) -> None:
         """
         Salva dados de matéria prima em arquivo CSV.
         
         Args:
-            data: Lista de dados de matéria prima
+            data: Lista de tuplas (COD, MAP, PES)
             output_file: Caminho do arquivo de saída
         """
-        if not data:
-            # Criar arquivo com cabeçalho solicitado
-            df = pd.DataFrame(columns=['EMP', 'COD', 'MAP', 'PES', 'PER'])
-        else:
-            df = pd.DataFrame(data, columns=['EMP', 'COD', 'MAP', 'PES', 'PER'])
-        
-        # Salvar com ponto e vírgula (UTF-8 com BOM) incluindo cabeçalho EMP;COD;MAP;PES;PER
-        df.to_csv(output_file, sep=';', index=False, encoding='utf-8-sig')
+        # Salvar com ponto e vírgula (UTF-8 com BOM) incluindo cabeçalho EMP;COD;MAP;PES;PER,
+        # mesmo quando não há dados
+        rows = (('001', code, material_code, weight, '0') for code, material_code, weight in data)
+        self.write_csv_rows(output_file, rows, ['EMP', 'COD', 'MAP', 'PES', 'PER'])
     
     def get_output_filename(self, request: ConversionRequest) -> str:
         """
@@ -3,12 +3,24 @@ Conversor para Verificação de Peças OLZ.
 Baseado na macro "4 - VERIFICAÇÃO PEÇAS OLZ CADASTRADAS.bas"
 """
 
+import functools
 import pandas as pd
 import logging
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 
 from ..models import ConversionRequest, ConversionResult, ProcessingStats
 from .base_converter import BaseConverter
+from ..excel_reader import read_excel_cached, read_csv_fast
+from ..conversion_cache import ConversionCache
+
+logger = logging.getLogger(__name__)
+
+# Códigos da planilha de referência por (caminho, mtime, tamanho): evita reler o arquivo
+# (em geral numa unidade de rede) a cada verificação enquanto ele não muda
+_reference_cache = ConversionCache(max_entries=2)
+# Um worker para carregar a planilha de referência enquanto o arquivo de entrada é lido
+_reference_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='olz-reference')
 
 
 class OLZVerificationConverter(BaseConverter):
@@ -24,7 +36,7 @@ class OLZVerificationConverter(BaseConverter):
     
     def __init__(self):
         super().__init__()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
     
     def convert(self, request: ConversionRequest) -> ConversionResult:
         """
@@ -37,17 +49,23 @@ class OLZVerificationConverter(BaseConverter):
             ConversionResult com o resultado
         """
         try:
+            # Carregar a planilha de referência (cadastrados) em paralelo com a leitura do
+            # arquivo de entrada: costuma estar numa unidade de rede
+            reference_future = _reference_loader.submit(self._load_reference_olz_codes)
+            
             # Ler arquivo Excel
-            df = pd.read_excel(request.input_file)
+            df = read_excel_cached(request.input_file)
             
             # Processar dados básicos (prepara utilitários e stats)
             _, item_to_code, _, stats = self.process_excel_data(df)
 
             # 1) Extrair todos os códigos OLZ únicos do arquivo de entrada
-            input_olz_codes = self._extract_unique_olz_codes(df)
+            # (conversão dos códigos feita uma vez e reaproveitada no passo 4)
+            code_occurrences = self.first_code_occurrences(df)
+            input_olz_codes = self._extract_unique_olz_codes(df, code_occurrences)
 
-            # 2) Carregar planilha de referência (cadastrados)
-            reference_codes = self._load_reference_olz_codes()
+            # 2) Planilha de referência (cadastrados), carregada em paralelo desde o início
+            reference_codes = reference_future.result()
 
             # 3) Calcular faltantes (presentes no input e não encontrados na referência)
             missing_codes = sorted(list(input_olz_codes - reference_codes))
@@ -55,7 +73,7 @@ class OLZVerificationConverter(BaseConverter):
             output_file = None
             if missing_codes:
                 # 4) Gerar arquivo completo com os faltantes (código + descrição + desenho original)
-                missing_data = self._build_missing_olz_data(df, missing_codes)
+                missing_data = self._build_missing_olz_data(df, missing_codes, code_occurrences)
                 output_file = self._save_missing_olz_csv(missing_data, self.get_output_filename(request))
                 stats.generated_relationships = len(missing_codes)
                 success_message = (
@@ -82,39 +100,23 @@ class OLZVerificationConverter(BaseConverter):
             self.logger.error(error_msg)
             return ConversionResult(False, error_msg)
     
-    def _extract_unique_olz_codes(self, df: pd.DataFrame) -> set:
+    def _extract_unique_olz_codes(self, df: pd.DataFrame,
+                                  code_occurrences: Optional[List[Tuple[int, str]]] = None) -> set:
         """
         Extrai códigos OLZ únicos a partir do XLSX de entrada.
+        Aceita o resultado de first_code_occurrences(df) já calculado.
         """
-        processed_codes = set()  # Para evitar duplicatas
-        
-        for index, row in df.iterrows():
-            drawing_number = row['N° DESENHO']
-            
-            # Pular linhas com '^' (já processadas no data_processor)
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                continue
-            
-            # Converter código
-            code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-            if not code:
-                continue
-            
-            # Evitar duplicatas
-            if code in processed_codes:
-                continue
-            processed_codes.add(code)
-            
-            # Manter apenas códigos OLZ ('Z...')
-            if code.startswith('Z'):
-                processed_codes.add(code)
-        return processed_codes
+        if code_occurrences is None:
+            code_occurrences = self.first_code_occurrences(df)
+        # Códigos já convertidos (sem '^' e sem vazios); manter apenas OLZ ('Z...')
+        return {code for _, code in code_occurrences if code.startswith('Z')}
 
-    def _load_reference_olz_codes(self) -> set:
+    def _load_reference_olz_codes(self) -> frozenset:
         """Carrega a planilha de referência com os códigos OLZ cadastrados.
         Procura o arquivo através da variável de ambiente 'SOLID_OLZ_REFERENCE_FILE'.
         Se não definida, usa o caminho padrão: P:\GUINCHOS E GUINDASTES\OL1 - GERENCIAMENTO DE PROJETO\TODOS CADASTRADOS.csv
-        Considera como coluna de código qualquer coluna cujo nome normalizado contenha 'codigo'/'código'/'cod'."""
+        Considera como coluna de código qualquer coluna cujo nome normalizado contenha 'codigo'/'código'/'cod'.
+        O conjunto lido fica em cache (imutável) enquanto o arquivo não for alterado."""
         import os
         from pathlib import Path
 
@@ -128,95 +130,93 @@ class OLZVerificationConverter(BaseConverter):
         if candidate and Path(candidate).is_file():
             path = Path(candidate)
 
-        codes = set()
+        codes = frozenset()
         if not path:
             # Sem referência: retornar conjunto vazio (nenhum cadastrado) para que todos virem faltantes
             return codes
 
         try:
+            file_stat = path.stat()
+            cache_key = (str(path.resolve()), file_stat.st_mtime_ns, file_stat.st_size)
+            cached_codes = _reference_cache.get(cache_key)
+            if cached_codes is not None:
+                return cached_codes
+            
             # Tentar ler como CSV primeiro (caminho padrão é .csv)
             if str(path).lower().endswith('.csv'):
-                ref_df = pd.read_csv(str(path), sep=';', encoding='utf-8-sig')
+                # Só o cabeçalho para escolher a coluna; depois lê apenas ela, como texto
+                header = pd.read_csv(str(path), sep=';', encoding='utf-8-sig', nrows=0).columns
+                code_col = self._find_reference_code_column(header)
+                ref_df = self._read_reference_csv_column(str(path), code_col)
             else:
-                ref_df = pd.read_excel(str(path))
+                ref_df = read_excel_cached(str(path))
+                code_col = self._find_reference_code_column(ref_df.columns)
             
-            # Normalizar nomes de colunas
-            norm = {self._normalize_header(c): c for c in ref_df.columns}
-            code_col = None
-            for key in ('codigo', 'código', 'cod'):
-                if key in norm:
-                    code_col = norm[key]
-                    break
-            if code_col is None:
-                # fallback: primeira coluna
-                code_col = ref_df.columns[0]
-            for val in ref_df[code_col]:
-                if pd.notna(val):
-                    s = str(val).strip()
-                    if s:
-                        codes.add(s)
+            # Códigos como texto aparado, sem vazios/ausentes, numa única passada vetorizada
+            ref_codes = self.column_as_text(ref_df[code_col]).str.strip()
+            codes = frozenset(ref_codes[ref_codes != ''].tolist())
+            _reference_cache.put(cache_key, codes)
         except Exception:
             # Em caso de erro de leitura, retorna conjunto vazio
-            return set()
+            return frozenset()
         return codes
     
-    def _build_missing_olz_data(self, df: pd.DataFrame, missing_codes: List[str]) -> List[Dict]:
+    def _find_reference_code_column(self, columns) -> Any:
+        """Retorna a coluna de código da planilha de referência (ou a primeira coluna)."""
+        # Normalizar nomes de colunas
+        norm = {self._normalize_header(c): c for c in columns}
+        for key in ('codigo', 'código', 'cod'):
+            if key in norm:
+                return norm[key]
+        # fallback: primeira coluna
+        return columns[0]
+
+    def _read_reference_csv_column(self, path: str, code_col: Any) -> pd.DataFrame:
+        """Lê somente a coluna de códigos do CSV de referência, sem inferência de tipos.
+        Usa o engine 'pyarrow' quando disponível, com fallback para o engine padrão."""
+        return read_csv_fast(path, sep=';', encoding='utf-8-sig', usecols=[code_col], dtype=str)
+    
+    def _build_missing_olz_data(self, df: pd.DataFrame, missing_codes: List[str],
+                                code_occurrences: Optional[List[Tuple[int, str]]] = None) -> List[Tuple[str, str, str]]:
         """
         Constrói dados completos para os códigos OLZ faltantes.
         
         Args:
             df: DataFrame original
             missing_codes: Lista de códigos OLZ que não foram encontrados na referência
+            code_occurrences: Resultado de first_code_occurrences(df), se já calculado
             
         Returns:
-            Lista de dicionários com dados completos dos faltantes
+            Lista de tuplas (Codigo, Descricao, Desenho_Original) dos faltantes
         """
-        missing_data = []
-        processed_codes = set()  # Para evitar duplicatas
+        if code_occurrences is None:
+            code_occurrences = self.first_code_occurrences(df)
+        missing_set = set(missing_codes)
+        # Primeira linha de cada código OLZ faltante
+        missing_rows = [(position, code) for position, code in code_occurrences
+                        if code.startswith('Z') and code in missing_set]
+        positions = [position for position, _ in missing_rows]
         
-        for index, row in df.iterrows():
-            drawing_number = row['N° DESENHO']
-            
-            # Pular linhas com '^' (já processadas no data_processor)
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                continue
-            
-            # Converter código
-            code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-            if not code or not code.startswith('Z'):
-                continue
-            
-            # Verificar se é um dos códigos faltantes
-            if code not in missing_codes or code in processed_codes:
-                continue
-            processed_codes.add(code)
-            
-            # Obter descrição da coluna C (Descrição) com fallback por posição
-            description = ""
-            try:
-                normalized_map = {self._normalize_header(col): col for col in df.columns}
-                target_key = 'descricao'
-                if target_key in normalized_map:
-                    value = row[normalized_map[target_key]]
-                    description = str(value) if pd.notna(value) else ""
-                else:
-                    value = row.iloc[2]  # coluna C
-                    description = str(value) if pd.notna(value) else ""
-            except Exception:
-                description = ""
-            description = self._sanitize_field(description)
-            
-            # Criar registro completo
-            missing_record = {
-                'Codigo': code,
-                'Descricao': description,
-                'Desenho_Original': str(drawing_number) if pd.notna(drawing_number) else "",
-                'Status': 'NÃO CADASTRADO'
-            }
-            
-            missing_data.append(missing_record)
+        # Descrição da coluna C (Descrição) com fallback por posição, só para as linhas faltantes
+        normalized_map = {self._normalize_header(col): col for col in df.columns}
+        if 'descricao' in normalized_map:
+            description_column = df[normalized_map['descricao']]
+        elif len(df.columns) > 2:
+            description_column = df.iloc[:, 2]  # coluna C
+        else:
+            description_column = None
+        if description_column is not None:
+            descriptions = self.sanitize_text_column(
+                self.column_as_text(description_column.iloc[positions])
+            ).tolist()
+        else:
+            descriptions = [""] * len(positions)
+        drawing_numbers = self.column_as_text(df['N° DESENHO'].iloc[positions]).tolist()
         
-        return missing_data
+        return [
+            (code, description, drawing_number)
+            for (_, code), description, drawing_number in zip(missing_rows, descriptions, drawing_numbers)
+        ]
     
     def _determine_registration_status(self, code: str, description: str) -> str:
         """
@@ -259,7 +259,7 @@ class OLZVerificationConverter(BaseConverter):
             else:
                 return 'Peça não encontrada no sistema'
     
-    def _save_missing_olz_csv(self, missing_data: List[Dict], output_file: str) -> str:
+    def _save_missing_olz_csv(self, missing_data: List[Tuple[str, str, str]], output_file: str) -> str:
         """
         Salva arquivo completo com os códigos OLZ não encontrados na referência.
         Retorna o caminho final gravado.
@@ -284,13 +284,9 @@ class OLZVerificationConverter(BaseConverter):
             filename = "OLZ FALTANTES.csv"
         final_path = os.path.join(directory, filename)
         
-        if not missing_data:
-            # Criar arquivo vazio com cabeçalho
-            df = pd.DataFrame(columns=['Codigo', 'Descricao', 'Desenho_Original', 'Status'])
-        else:
-            df = pd.DataFrame(missing_data)
-        
-        df.to_csv(final_path, sep=';', index=False, encoding='utf-8-sig', header=True)
+        # Com cabeçalho, mesmo vazio; Status é sempre 'NÃO CADASTRADO'
+        rows = ((code, description, drawing, 'NÃO CADASTRADO') for code, description, drawing in missing_data)
+        self.write_csv_rows(final_path, rows, ['Codigo', 'Descricao', 'Desenho_Original', 'Status'])
         return final_path
     
     def get_output_filename(self, request: ConversionRequest) -> str:
@@ -318,21 +314,9 @@ class OLZVerificationConverter(BaseConverter):
         return os.path.join(directory, filename)
 
     @staticmethod
-    def _sanitize_field(text: str) -> str:
-        """Sanitiza campo de texto removendo quebras de linha e caracteres problemáticos."""
-        try:
-            if text is None:
-                return ""
-            s = str(text).replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
-            s = s.replace(';', ',')
-            while '  ' in s:
-                s = s.replace('  ', ' ')
-            return s.strip()
-        except Exception:
-            return str(text) if text is not None else ""
-
-    @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _normalize_header(name: str) -> str:
+        # Também remove '/'; memorizado como o de BaseConverter (cabeçalhos se repetem)
         s = str(name).strip().lower()
         # Remover acentos básicos
         import unicodedata
@@ -3,12 +3,17 @@ Conversor para Cadastro de Peças e Montagens.
 Baseado na macro "1 - CADASTRO DE PEÇAS E MONTAGENS FABRICADAS.bas"
 """
 
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, List, Any, Tuple
 
 from ..models import ConversionRequest, ConversionResult, ProcessingStats
 from .base_converter import BaseConverter
+from ..excel_reader import read_excel_cached
+
+logger = logging.getLogger(__name__)
 
 
 class PartsRegistrationConverter(BaseConverter):
@@ -24,36 +29,9 @@ class PartsRegistrationConverter(BaseConverter):
     
     def __init__(self):
         super().__init__()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.max_field_length = 100
     
-    @staticmethod
-    def _sanitize_field(text: str) -> str:
-        """Remove quebras de linha e normaliza espaços para evitar quebra no CSV."""
-        try:
-            if text is None:
-                return ""
-            s = str(text).replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
-            # Evitar delimitador dentro do campo: troca ';' por ','
-            s = s.replace(';', ',')
-            # Colapsar múltiplos espaços
-            while '  ' in s:
-                s = s.replace('  ', ' ')
-            return s.strip()
-        except Exception:
-            return str(text) if text is not None else ""
-    
-    @staticmethod
-    def _normalize_header(name: str) -> str:
-        """Normaliza cabeçalho removendo acentos e espaços e colocando em minúsculas."""
-        try:
-            import unicodedata
-            nkfd = unicodedata.normalize('NFKD', str(name))
-            no_accents = "".join([c for c in nkfd if not unicodedata.combining(c)])
-            return no_accents.lower().strip().replace(" ", "")
-        except Exception:
-            return str(name).lower().strip().replace(" ", "")
-    
     def convert(self, request: ConversionRequest) -> ConversionResult:
         """
         Converte para formato de cadastro de peças e montagens.
@@ -66,7 +44,7 @@ class PartsRegistrationConverter(BaseConverter):
         """
         try:
             # Ler arquivo Excel
-            df = pd.read_excel(request.input_file)
+            df = read_excel_cached(request.input_file)
             
             # Processar dados
             items_by_level, item_to_code, exclusion_records, stats = self.process_excel_data(df)
@@ -74,7 +52,7 @@ class PartsRegistrationConverter(BaseConverter):
             # Gerar dados de cadastro
             registration_data = self._generate_registration_data(df, item_to_code, exclusion_records)
             # Ordenar alfabeticamente pela coluna A (Codigo)
-            registration_data.sort(key=lambda r: r.get('Codigo', ''))
+            registration_data.sort(key=itemgetter(0))
             
             # Salvar arquivo CSV
             output_file = self.get_output_filename(request)
@@ -115,7 +93,7 @@ class PartsRegistrationConverter(BaseConverter):
             self.logger.error(error_msg)
             return ConversionResult(False, error_msg)
     
-    def _generate_registration_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> List[Dict]:
+    def _generate_registration_data(self, df: pd.DataFrame, item_to_code: Dict, exclusion_records: List) -> List[Tuple[str, str, str]]:
         """
         Gera dados para cadastro de peças e montagens.
         
@@ -125,122 +103,110 @@ class PartsRegistrationConverter(BaseConverter):
             exclusion_records: Registros excluídos
             
         Returns:
-            Lista de dicionários com dados de cadastro
+            Lista de tuplas (Codigo, Descricao, Peso); as propriedades são constantes
         """
-        registration_data = []
-        processed_codes = set()  # Para evitar duplicatas
+        # Primeira linha de cada código válido (sem '^', sem duplicatas), excluindo peças OLZ ('Z...')
+        part_rows = [(position, code) for position, code in self.first_code_occurrences(df)
+                     if not code.startswith('Z')]
+        positions = [position for position, _ in part_rows]
         
-        for index, row in df.iterrows():
-            drawing_number = row['N° DESENHO']
-            
-            # Pular linhas com '^' (já processadas no data_processor)
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                continue
-            
-            # Converter código
-            code = self.data_processor.code_converter.convert_olg_code(drawing_number)
-            if not code:
-                continue
-            
-            # Evitar duplicatas
-            if code in processed_codes:
-                continue
-            processed_codes.add(code)
-            
-            # Coluna B deve trazer os dados da coluna C (DESCRIÇÃO) do arquivo de origem
-            # Suporta variações de cabeçalho e fallback pela posição (3ª coluna - índice 2)
-            description = ""
-            # Tente encontrar uma coluna cujo nome normalizado seja 'descricao'
-            try:
-                normalized_map = {self._normalize_header(col): col for col in df.columns}
-                target_key = 'descricao'
-                if target_key in normalized_map:
-                    value = row[normalized_map[target_key]]
-                    description = str(value) if pd.notna(value) else ""
-                else:
-                    # Fallback por posição (coluna C = índice 2)
-                    value = row.iloc[2]
-                    description = str(value) if pd.notna(value) else ""
-            except Exception:
-                # Último recurso: string vazia
-                description = ""
-            # Sanitizar descrição para não quebrar linha
-            description = self._sanitize_field(description)
-            
-            # Verificar se é peça OLZ (excluir)
-            if code.startswith('Z'):
-                continue
+        # Colunas de origem localizadas uma única vez (o cabeçalho não muda entre linhas)
+        normalized_map = {self._normalize_header(col): col for col in df.columns}
+        
+        # Coluna B deve trazer os dados da coluna C (DESCRIÇÃO) do arquivo de origem,
+        # com fallback pela posição (3ª coluna - índice 2); limpa para não quebrar linha
+        if 'descricao' in normalized_map:
+            description_column = df[normalized_map['descricao']]
+        elif len(df.columns) > 2:
+            description_column = df.iloc[:, 2]
+        else:
+            description_column = None
+        if description_column is not None:
+            descriptions = self.sanitize_text_column(
+                self.column_as_text(description_column.iloc[positions])
+            ).tolist()
+        else:
+            descriptions = [""] * len(positions)
+        
+        # Peso a partir da coluna PESO (H) do arquivo de origem, com fallback pela posição
+        if 'peso' in normalized_map:
+            weight_column = df[normalized_map['peso']]
+        elif len(df.columns) > 7:
+            weight_column = df.iloc[:, 7]
+        else:
+            weight_column = None
+        if weight_column is not None:
+            weights = self._format_weights(self.column_as_text(weight_column.iloc[positions]))
+        else:
+            weights = ['0'] * len(positions)
+        
+        return [
+            (code, description, weight)
+            for (_, code), description, weight in zip(part_rows, descriptions, weights)
+        ]
+    
+    @staticmethod
+    def _format_weights(texts: pd.Series) -> List[str]:
+        """
+        Normaliza os pesos para ponto (.) e até duas casas, sem zeros à direita
+        (formato como no CSV de exemplo). Valores não numéricos viram '0'.
+        Limpeza vetorizada; conversão e formatação uma vez por valor distinto.
+        
+        Args:
+            texts: Pesos como texto (aceita '1,23' ou '1.23')
             
-            # Obter peso a partir da coluna PESO (H) do arquivo de origem
-            peso_value = "0.00"
-            try:
-                normalized_map = {self._normalize_header(col): col for col in df.columns}
-                if 'peso' in normalized_map:
-                    raw = row[normalized_map['peso']]
-                    peso_value = str(raw) if pd.notna(raw) else "0.00"
-                else:
-                    raw = row.iloc[7]  # Coluna H por posição
-                    peso_value = str(raw) if pd.notna(raw) else "0.00"
-            except Exception:
-                peso_value = "0.00"
-
-            # Normalizar peso para ponto (.) e duas casas (formato como no CSV de exemplo)
+        Returns:
+            Pesos formatados (p.ex. '1.5', '2', '0'), na ordem de entrada
+        """
+        cleaned = (
+            texts.str.strip()
+            .str.replace('\u00A0', '', regex=False)
+            .str.replace(' ', '', regex=False)
+            .str.replace(',', '.', regex=False)
+        )
+        
+        def _format(txt: str) -> str:
             try:
-                # Aceitar valores como '1,23' ou '1.23'
-                txt = str(peso_value).strip()
-                txt = txt.replace('\u00A0', ' ').replace(' ', '')
-                txt = txt.replace(',', '.')
-                num = float(txt)
-                # Formatar com até 2 casas decimais, removendo zeros à direita
-                formatted = f"{num:.2f}".rstrip('0').rstrip('.')
-                peso_value = formatted if formatted != '' else '0'
+                formatted = f"{float(txt):.2f}".rstrip('0').rstrip('.')
+                return formatted if formatted != '' else '0'
             except Exception:
-                # Se não for numérico, cai para '0'
-                peso_value = '0'
-
-            # Criar registro de cadastro
-            registration_record = {
-                'Codigo': code,
-                'Descricao': description,
-                'Prop3': '3',
-                'Prop4': '4',
-                'Prop107': '107',
-                'Prop108': '108',
-                'Prop16': '16',
-                'Prop3_2': '3',
-                'PropS': 'S',
-                'Peso': peso_value
-            }
-            
-            registration_data.append(registration_record)
+                return '0'
         
-        return registration_data
+        formatted_by_text = {txt: _format(txt) for txt in cleaned.unique().tolist()}
+        return [formatted_by_text[txt] for txt in cleaned.tolist()]
     
-    def _save_registration_csv(self, data: List[Dict], output_file: str) -> None:
+    def _save_registration_csv(self, data: List[Tuple[str, str, str]], output_file: str) -> None:
         """
         Salva dados de cadastro em arquivo CSV.
         
         Args:
-            data: Lista de dados de cadastro
+            data: Lista de tuplas (Codigo, Descricao, Peso)
             output_file: Caminho do arquivo de saída
         """
-        # Escrever em CP-1252 (Windows) sem cabeçalho, como o arquivo de referência
-        import io
-        df = pd.DataFrame(data, columns=['Codigo', 'Descricao', 'Prop3', 'Prop4', 'Prop107', 'Prop108', 'Prop16', 'Prop3_2', 'PropS', 'Peso']) if data else pd.DataFrame(columns=['Codigo', 'Descricao', 'Prop3', 'Prop4', 'Prop107', 'Prop108', 'Prop16', 'Prop3_2', 'PropS', 'Peso'])
-        with open(output_file, 'w', encoding='cp1252', errors='replace', newline='') as f:
-            df.to_csv(f, sep=';', index=False, header=False)
+        # Escrever em CP-1252 (Windows) sem cabeçalho, como o arquivo de referência;
+        # colunas C-I são as propriedades constantes
+        rows = ((code, description, '3', '4', '107', '108', '16', '3', 'S', weight) for code, description, weight in data)
+        self.write_csv_rows(output_file, rows, encoding='cp1252', errors='replace')
 
-    def _check_field_lengths(self, data: List[Dict], limit: int) -> List[str]:
+    def _check_field_lengths(self, data: List[Tuple[str, str, str]], limit: int) -> List[str]:
         warnings: List[str] = []
         try:
+            if not data:
+                return warnings
+            # Comprimentos das duas colunas calculados de uma vez; só as linhas acima do limite são visitadas
+            codes, descriptions, _ = zip(*data)
+            code_lengths = pd.Series(codes, dtype=object).str.len().to_numpy()
+            description_lengths = pd.Series(descriptions, dtype=object).str.len().to_numpy()
+            too_long = (code_lengths > limit) | (description_lengths > limit)
             # Cabeçalho humano: linha 1. Dados iniciam em 1 (sem cabeçalho no arquivo final),
             # mas para exibição ao usuário, consideramos a primeira linha de dados como 1.
-            for idx, row in enumerate(data, start=1):
-                for key in ['Codigo', 'Descricao']:
-                    text = str(row.get(key, ''))
-                    if len(text) > limit:
-                        warnings.append(f"Linha {idx}: {key} muito longo para Código {row.get('Codigo','')} (len={len(text)})")
-                        break
+            for position in np.flatnonzero(too_long).tolist():
+                code = codes[position]
+                if code_lengths[position] > limit:
+                    key, length = 'Codigo', code_lengths[position]
+                else:
+                    key, length = 'Descricao', description_lengths[position]
+                warnings.append(f"Linha {position + 1}: {key} muito longo para Código {code} (len={length})")
         except Exception:
             pass
         return warnings
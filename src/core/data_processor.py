@@ -3,19 +3,45 @@ Módulo de processamento de dados para o sistema SOLID_STRUCTURE.
 Implementa o princípio Single Responsibility Principle (SRP).
 """
 
+import csv
+import io
+import os
 import re
+import numpy as np
 import pandas as pd
+from collections import defaultdict
 from typing import Dict, List, Tuple, Optional, Any
 import logging
 
 from .models import ProcessingStats, ValidationError
 
+logger = logging.getLogger(__name__)
+
+# Only digits, dots and whitespace are allowed in an ITEM (checked with fullmatch by both
+# parse_hierarchy_level and parse_hierarchy_levels)
+_ITEM_CHARS_PATTERN = re.compile(r'[0-9\.\s]+')
+
+
+def _csv_quote_pattern() -> re.Pattern:
+    """Characters that make csv.writer (as DataFrame.to_csv used it: ';', os.linesep) quote a field."""
+    quote_chars = ''
+    for char in ';"\r\n':
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=';', lineterminator=os.linesep).writerow(['x' + char])
+        if buffer.getvalue().startswith('"'):
+            quote_chars += char
+    return re.compile('[' + re.escape(quote_chars) + ']')
+
+
+# A lone '\r' is quoted or not depending on the Python version and line ending: probe it once
+_CSV_QUOTE_PATTERN = _csv_quote_pattern()
+
 
 class OLGCodeConverter:
     """Classe responsável por converter códigos OL*."""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
     
     def convert_olg_code(self, olg_code: Any) -> Optional[str]:
         """
@@ -78,13 +104,56 @@ class OLGCodeConverter:
         except Exception as e:
             self.logger.error(f"Erro ao converter código '{olg_code}': {str(e)}")
             raise ValidationError(f"Erro na conversão do código '{olg_code}': {str(e)}")
+    
+    def convert_olg_codes(self, olg_codes: pd.Series) -> pd.Series:
+        """
+        Vectorized convert_olg_code for a whole column.
+        Gives the same code as convert_olg_code for each value.
+        
+        Args:
+            olg_codes: Column with the codes to convert (any dtype)
+            
+        Returns:
+            Object Series with the same index: converted codes, None where invalid
+        """
+        present = olg_codes.notna().to_numpy(dtype=bool)
+        # Drawing numbers repeat across the BOM: the string work below runs once per
+        # distinct text. Factorized as text so that e.g. 1 and 1.0 ('1' / '1.0') stay apart.
+        # Only non-missing cells are factorized, so every code id points at a real text
+        texts = np.array([str(value) for value in olg_codes.to_numpy(dtype=object)[present]], dtype=object)
+        code_ids, distinct_texts = pd.factorize(texts)
+        code_strs = pd.Series(distinct_texts, dtype=object).str.strip()
+        
+        # "OL" followed by a letter loses the prefix; then dashes and spaces go away
+        has_ol_prefix = code_strs.str.startswith('OL') & code_strs.str[2:3].str.isalpha()
+        converted = code_strs.where(~has_ol_prefix, code_strs.str[2:])
+        converted = converted.str.replace('-', '', regex=False).str.replace(' ', '', regex=False)
+        
+        # Codes shorter than 3 characters are returned as they are
+        too_short = (code_strs.str.len() < 3) & (code_strs != '')
+        converted = converted.where(~too_short, code_strs)
+        
+        # Same warnings as the scalar version, once per distinct code
+        emptied = (code_strs != '') & (converted == '')
+        too_long = converted.str.len() > 50
+        for code_str in code_strs[too_short]:
+            self.logger.warning(f"Código muito curto para conversão: '{code_str}'")
+        for code_str in code_strs[emptied]:
+            self.logger.warning(f"Código convertido vazio resultante de: '{code_str}'")
+        for converted_code, code_str in zip(converted[too_long], code_strs[too_long]):
+            self.logger.warning(f"Código convertido muito longo: '{converted_code}' (original: '{code_str}')")
+        
+        distinct_codes = converted.where(converted != '', None).to_numpy(dtype=object)
+        codes = np.full(len(olg_codes), None, dtype=object)
+        codes[present] = distinct_codes.take(code_ids)
+        return pd.Series(codes, index=olg_codes.index, dtype=object)
 
 
 class HierarchyLevelParser:
     """Classe responsável por analisar níveis de hierarquia."""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
     
     def parse_hierarchy_level(self, item_str: Any) -> int:
         """
@@ -111,7 +180,7 @@ class HierarchyLevelParser:
                 return -1
             
             # Validate basic format (should contain only numbers, dots, and spaces)
-            if not re.match(r'^[0-9\.\s]+$', item_str):
+            if not _ITEM_CHARS_PATTERN.fullmatch(item_str):
                 self.logger.warning(f"Formato de item inválido: '{item_str}' (contém caracteres não numéricos)")
                 return -1
             
@@ -148,87 +217,134 @@ class HierarchyLevelParser:
             raise ValidationError(f"Erro na análise do nível de hierarquia: {str(e)}")
 
 
+    # Vectorized equivalent of the checks in parse_hierarchy_level: only digits,
+    # dots and whitespace, and every dot-separated part is blank or a number
+    _VALID_ITEM_PATTERN = r'\s*[0-9]*\s*(?:\.\s*[0-9]*\s*)*'
+    _MAIN_ASSEMBLY_PATTERN = r'[^.]*\.\s*0\s*'
+    
+    def parse_hierarchy_levels(self, item_strings: List[str]) -> np.ndarray:
+        """
+        Parses the hierarchy level of a whole ITEM column at once.
+        Gives the same levels as parse_hierarchy_level for already stripped strings.
+        
+        Args:
+            item_strings: Stripped item strings
+            
+        Returns:
+            Array with the hierarchy level (0-based) of each item, -1 where invalid
+        """
+        items = pd.Series(item_strings, dtype=object)
+        non_empty = (items != '').to_numpy(dtype=bool)
+        valid = non_empty & items.str.fullmatch(self._VALID_ITEM_PATTERN).to_numpy(dtype=bool)
+        dots = items.str.count(r'\.')
+        # '1' and '1.0' style items are level 0, everything else is the dot count
+        main_assembly = items.str.fullmatch(self._MAIN_ASSEMBLY_PATTERN)
+        levels = np.where(main_assembly, 0, dots)
+        levels = np.where(valid, levels, -1)
+        
+        # Same warnings as parse_hierarchy_level, once per distinct item
+        invalid = non_empty & ~valid
+        if invalid.any():
+            allowed_chars = items.str.fullmatch(_ITEM_CHARS_PATTERN.pattern).to_numpy(dtype=bool)
+            for item_str in pd.unique(items[invalid & ~allowed_chars]):
+                self.logger.warning(f"Formato de item inválido: '{item_str}' (contém caracteres não numéricos)")
+            for item_str in pd.unique(items[invalid & allowed_chars]):
+                part_clean = next((part.strip() for part in item_str.split('.')
+                                  if part.strip() and not part.strip().isdigit()), '')
+                self.logger.warning(f"Parte não numérica em item: '{item_str}' (parte: '{part_clean}')")
+        too_deep = levels > 10
+        if too_deep.any():
+            for item_str, level in dict(zip(items[too_deep], levels[too_deep].tolist())).items():
+                self.logger.warning(f"Nível de hierarquia muito profundo: {level} para item '{item_str}'")
+        return levels
+
+
 class DataProcessor:
     """Classe principal de processamento de dados."""
     
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.code_converter = OLGCodeConverter()
         self.hierarchy_parser = HierarchyLevelParser()
     
-    def process_excel_data(self, df: pd.DataFrame) -> Tuple[Dict, Dict, List, ProcessingStats]:
+    def process_excel_data(self, df: pd.DataFrame, collect_exclusions: bool = True) -> Tuple[Dict, Dict, List, ProcessingStats]:
         """
         Process Excel data and organize by hierarchy levels.
         
         Args:
             df: DataFrame with Excel data
+            collect_exclusions: Build a record per excluded row (for the exclusions
+                report); when False exclusion_records is empty, the stats still count them
             
         Returns:
             Tuple of (items_by_level, item_to_code, exclusion_records, stats)
         """
         items_by_level = {}  # level -> [(item, quantity, child_code, original_index)]
         item_to_code = {}    # item -> child_code
-        
-        # Counters for statistics
-        ignored_caret_rows = 0
-        skipped_no_code_rows = 0
-        skipped_invalid_level_rows = 0
-        considered_valid_rows = 0
         exclusion_records = []
-        
-        for index, row in df.iterrows():
-            item = str(row['ITEM']).strip()
-            quantity = row['QTD']
-            drawing_number = row['N° DESENHO']
-            material_code = row['CODIGO MP20']
 
-            # Always ignore rows where drawing number contains '^'
-            if pd.notna(drawing_number) and '^' in str(drawing_number):
-                ignored_caret_rows += 1
-                exclusion_records.append({
-                    'MOTIVO': "'^' em N° DESENHO",
-                    'LINHA_XLSX': index + 2,  # +2: header is line 1, df index starts at 0
-                    'ITEM': item,
-                    'QTD': quantity,
-                    'N° DESENHO': drawing_number,
-                    'CODIGO MP20': material_code
-                })
-                continue
-            
-            # Convert drawing number to code
-            child_code = self.code_converter.convert_olg_code(drawing_number)
-            if not child_code:
-                skipped_no_code_rows += 1
-                exclusion_records.append({
-                    'MOTIVO': 'N° DESENHO inválido ou ausente (sem código convertido)',
-                    'LINHA_XLSX': index + 2,
-                    'ITEM': item,
-                    'QTD': quantity,
-                    'N° DESENHO': drawing_number,
-                    'CODIGO MP20': material_code
-                })
-                continue
-            
-            # Determine hierarchy level
-            level = self.hierarchy_parser.parse_hierarchy_level(item)
-            if level < 0:
-                skipped_invalid_level_rows += 1
-                exclusion_records.append({
-                    'MOTIVO': 'ITEM inválido (nível não identificável)',
-                    'LINHA_XLSX': index + 2,
-                    'ITEM': item,
-                    'QTD': quantity,
-                    'N° DESENHO': drawing_number,
-                    'CODIGO MP20': material_code
-                })
-                continue
-                
-            # Store item information
+        # Pull the raw column arrays once; iterrows() would build a Series per row
+        items = [str(raw_item).strip() for raw_item in df['ITEM'].to_numpy()]
+        quantities = df['QTD'].to_numpy()
+        drawing_numbers = df['N° DESENHO'].to_numpy()
+        material_codes = df['CODIGO MP20'].to_numpy()
+        row_indexes = df.index.tolist()
+        # Converted codes for the whole column in one vectorized pass
+        code_series = self.code_converter.convert_olg_codes(df['N° DESENHO'])
+        child_codes = code_series.tolist()
+        
+        # Exclusion masks, checked in this order: '^' in the drawing number,
+        # no converted code, unidentifiable hierarchy level
+        drawing_series = df['N° DESENHO']
+        has_caret = (
+            drawing_series.notna()
+            & drawing_series.astype(object).astype(str).str.contains('^', regex=False)
+        ).to_numpy(dtype=bool)
+        no_code = ~has_caret & code_series.isna().to_numpy(dtype=bool)
+        
+        # Hierarchy levels only for the rows that get that far, so the ITEM
+        # warnings stay limited to them
+        levels = np.full(len(items), -1)
+        level_positions = np.flatnonzero(~has_caret & ~no_code)
+        if len(level_positions):
+            levels[level_positions] = self.hierarchy_parser.parse_hierarchy_levels(
+                [items[position] for position in level_positions.tolist()])
+        invalid_level = ~has_caret & ~no_code & (levels < 0)
+        valid = ~(has_caret | no_code | invalid_level)
+        
+        ignored_caret_rows = int(has_caret.sum())
+        skipped_no_code_rows = int(no_code.sum())
+        skipped_invalid_level_rows = int(invalid_level.sum())
+        considered_valid_rows = int(valid.sum())
+        
+        # Exclusion records in sheet order, only for the excluded rows and only when requested
+        excluded_positions = np.flatnonzero(~valid).tolist() if collect_exclusions else []
+        if excluded_positions:
+            reasons = np.select(
+                [has_caret, no_code],
+                ["'^' em N° DESENHO", 'N° DESENHO inválido ou ausente (sem código convertido)'],
+                default='ITEM inválido (nível não identificável)'
+            )
+        for position in excluded_positions:
+            exclusion_records.append({
+                'MOTIVO': str(reasons[position]),
+                'LINHA_XLSX': row_indexes[position] + 2,  # +2: header is line 1, df index starts at 0
+                'ITEM': items[position],
+                'QTD': quantities[position],
+                'N° DESENHO': drawing_numbers[position],
+                'CODIGO MP20': material_codes[position]
+            })
+        
+        # Store item information for the valid rows only
+        level_list = levels.tolist()
+        for position in np.flatnonzero(valid).tolist():
+            item = items[position]
+            child_code = child_codes[position]
+            level = level_list[position]
             if level not in items_by_level:
                 items_by_level[level] = []
-            items_by_level[level].append((item, quantity, child_code, index))
+            items_by_level[level].append((item, quantities[position], child_code, row_indexes[position]))
             item_to_code[item] = child_code
-            considered_valid_rows += 1
         
         # Create processing statistics
         stats = ProcessingStats(
@@ -246,8 +362,36 @@ class DataProcessor:
 class CSVGenerator:
     """Classe responsável por gerar o arquivo CSV."""
     
+    # Flush threshold for save_csv_file
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
+    
+    @staticmethod
+    def _aggregate_children(children: List) -> Tuple[Dict, Dict, Dict]:
+        """
+        Aggregate the rows of one parent by child code in a single pass.
+        
+        Args:
+            children: Rows as (item, quantity, child_code, original_index)
+            
+        Returns:
+            Tuple of (aggregate, representative_item, code_occurrences) keyed by child code
+        """
+        aggregate = {}            # child_code -> summed quantity
+        representative_item = {}  # child_code -> first item seen
+        code_occurrences = {}     # child_code -> [(item, quantity, original_index)]
+        
+        for item, quantity, child_code, original_index in children:
+            occurrences = code_occurrences.get(child_code)
+            if occurrences is None:
+                occurrences = code_occurrences[child_code] = []
+                representative_item[child_code] = item
+            occurrences.append((item, quantity, original_index))
+            aggregate[child_code] = aggregate.get(child_code, 0) + (quantity if pd.notna(quantity) else 0)
+        
+        return aggregate, representative_item, code_occurrences
     
     def build_parent_child_relationships(self, items_by_level: Dict, root_assembly_code: str) -> Tuple[List, Dict, List, List]:
         """
@@ -258,28 +402,20 @@ class CSVGenerator:
             root_assembly_code: Main assembly code
             
         Returns:
-            Tuple of (output_rows, edge_to_quantity, duplicate_records, consolidated_relationships)
+            Tuple of (output_rows, edge_to_quantity, duplicate_records, consolidated_relationships);
+            output_rows holds (MTG, COD, QTD) tuples, EMP and PER are constant
         """
         output_rows = []
         edge_to_quantity = {}  # (parent_code, child_code) -> summed quantity
         processed_parent_code_to_item = {}
+        previous_level_parents = {}  # parents registered on the level above, in registration order
         duplicate_records = []
         consolidated_relationships = []
 
         # Level 0: aggregate direct children of main assembly
         if 0 in items_by_level:
-            aggregate = {}
-            representative_item_for_code = {}
-            code_occurrences = {}  # track which rows had each code
-            
-            for item, quantity, child_code, original_index in items_by_level[0]:
-                if child_code not in code_occurrences:
-                    code_occurrences[child_code] = []
-                code_occurrences[child_code].append((item, quantity, original_index))
-                aggregate[child_code] = aggregate.get(child_code, 0) + (quantity if pd.notna(quantity) else 0)
-                if child_code not in representative_item_for_code:
-                    representative_item_for_code[child_code] = item
-                    
+            aggregate, representative_item_for_code, code_occurrences = self._aggregate_children(items_by_level[0])
+
             for child_code, total_qty in aggregate.items():
                 # If this code appeared multiple times, record ALL occurrences (including first)
                 if len(code_occurrences[child_code]) > 1:
@@ -306,51 +442,38 @@ class CSVGenerator:
                 
                 edge_to_quantity[(root_assembly_code, child_code)] = edge_to_quantity.get((root_assembly_code, child_code), 0) + total_qty
                 processed_parent_code_to_item[child_code] = (representative_item_for_code[child_code], 0)
+                previous_level_parents[child_code] = processed_parent_code_to_item[child_code]
                 # Emit in BFS order for level 0
-                output_rows.append({
-                    'EMP': '001',
-                    'MTG': root_assembly_code,
-                    'COD': child_code,
-                    'QTD': total_qty,
-                    'PER': 0
-                })
+                output_rows.append((root_assembly_code, child_code, total_qty))
 
         # Process deeper levels in breadth-first manner with aggregation and deduplication
         current_level = 1
-        while current_level in items_by_level and any(level == current_level - 1 for (_, level) in processed_parent_code_to_item.values()):
-            # Select parents from previous level (unique by code)
-            previous_level_parents = {code: (item, level) for code, (item, level) in processed_parent_code_to_item.items() if level == current_level - 1}
+        while current_level in items_by_level and previous_level_parents:
             # Prepare next level parents to add (avoid reprocessing same code)
             next_level_additions = {}
 
+            # Assign every row of this level to its parent key once, instead of
+            # re-scanning the whole level for each parent:
+            # - children_by_parent: "1.2.3" -> "1.2" (sub-assemblies, prefix matching)
+            # - children_by_root:   "1.3"   -> "1"   (main assemblies such as "1.0")
+            children_by_parent = defaultdict(list)
+            children_by_root = defaultdict(list)
+            for entry in items_by_level[current_level]:
+                item = entry[0]
+                children_by_parent[item.rsplit('.', 1)[0]].append(entry)
+                if not item.endswith('.0'):
+                    children_by_root[item.split('.', 1)[0]].append(entry)
+
             for parent_code, (parent_item, _) in previous_level_parents.items():
+                if parent_item.endswith('.0'):
+                    # For main assemblies (1.0, 2.0), children are 1.1, 1.2, 2.1, 2.2, etc.
+                    children = children_by_root.get(parent_item.split('.')[0], [])
+                else:
+                    # For sub-assemblies, use normal prefix matching
+                    children = children_by_parent.get(parent_item, [])
+
                 # Aggregate this parent's children on this level
-                child_aggregate = {}
-                child_representative_item = {}
-                code_occurrences = {}  # track which rows had each code for this parent
-                
-                for item, quantity, child_code, original_index in items_by_level[current_level]:
-                    # Extract parent prefix: "1.0" -> "1", "2.0" -> "2", "1.1" -> "1.1"
-                    parent_prefix = parent_item.split('.')[0] if '.' in parent_item else parent_item
-                    if parent_item.endswith('.0'):
-                        # For main assemblies (1.0, 2.0), children are 1.1, 1.2, 2.1, 2.2, etc.
-                        parent_prefix = parent_item.split('.')[0]
-                        if item.startswith(parent_prefix + '.') and not item.endswith('.0'):
-                            if child_code not in code_occurrences:
-                                code_occurrences[child_code] = []
-                            code_occurrences[child_code].append((item, quantity, original_index))
-                            child_aggregate[child_code] = child_aggregate.get(child_code, 0) + (quantity if pd.notna(quantity) else 0)
-                            if child_code not in child_representative_item:
-                                child_representative_item[child_code] = item
-                    else:
-                        # For sub-assemblies, use normal prefix matching
-                        if item.startswith(parent_item + '.'):
-                            if child_code not in code_occurrences:
-                                code_occurrences[child_code] = []
-                            code_occurrences[child_code].append((item, quantity, original_index))
-                            child_aggregate[child_code] = child_aggregate.get(child_code, 0) + (quantity if pd.notna(quantity) else 0)
-                            if child_code not in child_representative_item:
-                                child_representative_item[child_code] = item
+                child_aggregate, child_representative_item, code_occurrences = self._aggregate_children(children)
 
                 # Check for duplicates and record them
                 for child_code, occurrences in code_occurrences.items():
@@ -379,38 +502,71 @@ class CSVGenerator:
                         })
                     
                     edge_to_quantity[(parent_code, child_code)] = edge_to_quantity.get((parent_code, child_code), 0) + total_qty
-                    output_rows.append({
-                        'EMP': '001',
-                        'MTG': parent_code,
-                        'COD': child_code,
-                        'QTD': total_qty,
-                        'PER': 0
-                    })
+                    output_rows.append((parent_code, child_code, total_qty))
                     if child_code not in processed_parent_code_to_item and child_code not in next_level_additions:
                         next_level_additions[child_code] = (child_representative_item[child_code], current_level)
 
-            # Add next level unique parents
+            # Add next level unique parents; they are the parents of the following level
             processed_parent_code_to_item.update(next_level_additions)
+            previous_level_parents = next_level_additions
             current_level += 1
         
         return output_rows, edge_to_quantity, duplicate_records, consolidated_relationships
     
+    @staticmethod
+    def _csv_field(value: Any) -> str:
+        """Format a text field the way csv.QUOTE_MINIMAL does for ';' separated output."""
+        text = str(value)
+        if _CSV_QUOTE_PATTERN.search(text):
+            return '"' + text.replace('"', '""') + '"'
+        return text
+    
+    @staticmethod
+    def has_float_quantities(output_rows: List) -> bool:
+        """
+        Whether the QTD column is written as float: DataFrame.to_csv promoted the
+        whole column to float when any quantity was a float.
+        
+        Args:
+            output_rows: List of (MTG, COD, QTD) tuples
+            
+        Returns:
+            True when every quantity is written as a float
+        """
+        return any(isinstance(quantity, float) for _, _, quantity in output_rows)
+    
     def save_csv_file(self, output_rows: List, output_file: str) -> None:
         """
         Save the processed data to CSV file.
         
+        Rows are formatted directly into a byte buffer that is flushed in large
+        chunks, keeping the output byte-identical to the former DataFrame.to_csv
+        export (float quantities as '2.0' when any quantity is fractional,
+        os.linesep after each data row).
+        
         Args:
-            output_rows: List of output rows
+            output_rows: List of (MTG, COD, QTD) tuples
             output_file: Path to output CSV file
         """
-        import pandas as pd
+        import codecs
+        import os
         
-        # Create output DataFrame
-        output_df = pd.DataFrame(output_rows)
+        float_quantities = self.has_float_quantities(output_rows)
+        line_end = os.linesep
+        csv_field = self._csv_field
         
-        # Save to CSV with semicolon separator and header row (UTF-8 with BOM for Excel)
-        with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
-            # Write header row first
-            f.write('EMP;MTG;COD;QTD;PER\n')
-            # Write data rows without header
-            output_df.to_csv(f, sep=';', index=False, header=False)
+        # UTF-8 with BOM for Excel, header row first
+        with open(output_file, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+            buffer = bytearray(codecs.BOM_UTF8)
+            buffer += b'EMP;MTG;COD;QTD;PER\n'
+            for parent_code, child_code, quantity in output_rows:
+                if float_quantities:
+                    quantity = '' if quantity != quantity else repr(float(quantity))
+                # EMP is always '001' and PER always 0
+                buffer += (
+                    f"001;{csv_field(parent_code)};{csv_field(child_code)};{quantity};0{line_end}"
+                ).encode('utf-8')
+                if len(buffer) >= self.WRITE_BUFFER_SIZE:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
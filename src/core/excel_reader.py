@@ -0,0 +1,185 @@
+"""
+Leitura de planilhas de estrutura para o sistema SOLID_STRUCTURE.
+Implementa o princípio Single Responsibility Principle (SRP).
+"""
+
+import os
+import logging
+import threading
+import importlib.util
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from .conversion_cache import ConversionCache
+
+logger = logging.getLogger(__name__)
+
+# Parsed sheets by (absolute path, mtime, size): the conversion types all read the same file
+_read_cache = ConversionCache(max_entries=4)
+# One lock per cache key while that file is being parsed; _read_lock only guards the map,
+# so different files (e.g. the input and the OLZ reference workbook) are parsed side by side
+_read_lock = threading.Lock()
+_key_locks = {}
+
+# python-calamine (Rust) is optional; when installed pandas can use it as an engine
+_HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+# pyarrow is optional too: multithreaded CSV parsing for read_csv_fast
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Text columns kept as Arrow strings when pyarrow is installed: packed UTF-8
+# instead of one Python object per cell in every cached sheet
+_TEXT_COLUMNS = ('N° DESENHO', 'CODIGO MP20')
+_TEXT_DTYPE = 'string[pyarrow]' if _HAS_PYARROW else None
+
+
+def _read_xlsx_rows(file_path: str) -> list:
+    """
+    Stream the first worksheet of an XLSX file as lists of cell values.
+
+    Mirrors the cell conversion done by pandas' openpyxl engine (empty cells
+    as '', integral floats as int, trailing empty cells/rows trimmed) while
+    reading plain values instead of allocating a cell object per cell.
+
+    Args:
+        file_path: Path to the XLSX file
+
+    Returns:
+        List of rows (header first), all padded to the same width
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook.worksheets[0]
+        sheet.reset_dimensions()
+
+        data = []
+        last_row_with_data = -1
+        for row_number, values in enumerate(sheet.iter_rows(values_only=True)):
+            row = [
+                '' if value is None
+                else int(value) if isinstance(value, float) and value.is_integer()
+                else value
+                for value in values
+            ]
+            while row and row[-1] == '':
+                row.pop()
+            if row:
+                last_row_with_data = row_number
+            data.append(row)
+    finally:
+        workbook.close()
+
+    data = data[:last_row_with_data + 1]
+    if data:
+        max_width = max(len(row) for row in data)
+        data = [row + [''] * (max_width - len(row)) for row in data]
+    return data
+
+
+def read_excel_file(file_path: str) -> pd.DataFrame:
+    """
+    Read the first sheet of a structure file into a DataFrame.
+
+    Uses the calamine engine when python-calamine is installed (both .xlsx
+    and .xls). Otherwise XLSX files are streamed through openpyxl in read-only
+    mode and other formats (e.g. legacy .xls) go through pandas.read_excel.
+    The result matches pd.read_excel(file_path) in columns and dtypes.
+
+    Args:
+        file_path: Path to the Excel file
+
+    Returns:
+        DataFrame with the sheet contents
+    """
+    if _HAS_CALAMINE:
+        try:
+            return pd.read_excel(file_path, engine='calamine')
+        except Exception as e:
+            # e.g. pandas < 2.2 has no calamine engine: use the readers below
+            logger.debug(f"Leitura com calamine falhou para '{file_path}': {e}")
+
+    if os.path.splitext(file_path)[1].lower() != '.xlsx':
+        return pd.read_excel(file_path)
+
+    from openpyxl.cell.cell import ERROR_CODES
+
+    rows = _read_xlsx_rows(file_path)
+    if not rows:
+        return pd.DataFrame()
+
+    # Error cells (#N/A, #REF!, ...) arrive as plain strings in values mode
+    with TextParser(rows, header=0, na_values=list(ERROR_CODES)) as parser:
+        return parser.read()
+
+
+def _with_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the text columns of a structure sheet to Arrow-backed strings.
+
+    Cells are converted like str(value) (via object dtype) and missing cells
+    become pd.NA. Without pyarrow the DataFrame is returned unchanged.
+
+    Args:
+        df: DataFrame read from the sheet
+
+    Returns:
+        The same DataFrame, with the text columns cast in place
+    """
+    if _TEXT_DTYPE is None:
+        return df
+    for column in _TEXT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(object).astype(_TEXT_DTYPE)
+    return df
+
+
+def read_excel_cached(file_path: str) -> pd.DataFrame:
+    """
+    Read a structure file through read_excel_file, reusing the parsed sheet
+    while the file is unchanged (same path, modification time and size).
+
+    Args:
+        file_path: Path to the Excel file
+
+    Returns:
+        A copy of the cached DataFrame, safe for the caller to modify
+    """
+    key = _read_cache.make_key(file_path)
+    with _read_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    # Conversions running side by side on the same file parse it only once
+    with key_lock:
+        try:
+            df = _read_cache.get(key)
+            if df is None:
+                df = _with_text_columns(read_excel_file(file_path))
+                _read_cache.put(key, df)
+        finally:
+            # Later readers find the sheet in the cache (or retry after an error)
+            with _read_lock:
+                if _key_locks.get(key) is key_lock:
+                    del _key_locks[key]
+    return df.copy()
+
+
+def read_csv_fast(file_path: str, **read_kwargs) -> pd.DataFrame:
+    """
+    pd.read_csv using the pyarrow engine when pyarrow is installed.
+
+    Falls back to the default C engine when pyarrow is missing or rejects the
+    options (the pyarrow engine does not support e.g. callable skiprows).
+
+    Args:
+        file_path: Path to the CSV file
+        **read_kwargs: Options for pd.read_csv
+
+    Returns:
+        DataFrame with the CSV contents
+    """
+    if _HAS_PYARROW:
+        try:
+            return pd.read_csv(file_path, engine='pyarrow', **read_kwargs)
+        except Exception as e:
+            logger.debug(f"Leitura com pyarrow falhou para '{file_path}': {e}")
+    return pd.read_csv(file_path, **read_kwargs)
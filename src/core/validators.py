@@ -5,12 +5,22 @@ Implementa o princípio Single Responsibility Principle (SRP).
 
 import re
 import os
+import stat
 from pathlib import Path
 from typing import Tuple
 
 from .models import ValidationResult, ValidationError, ConversionConfig
 
 
+# Códigos de montagem: letras, números e ponto
+_ASSEMBLY_CODE_PATTERN = re.compile(r'[A-Za-z0-9.]+')
+_INVALID_ASSEMBLY_CHARS_PATTERN = re.compile(r'[^A-Za-z0-9.]')
+# Tabela para remover, via str.translate, os caracteres ASCII inválidos
+_ASSEMBLY_CODE_DELETE_TABLE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c == '.')
+))
+
+
 class FileValidator:
     """Classe responsável por validar arquivos."""
     
@@ -36,21 +46,24 @@ class FileValidator:
         
         path = Path(file_path)
         
-        if not path.exists():
-            errors.append(f"Arquivo não encontrado: {file_path}")
+        # Check file extension first: a string compare, no filesystem access
+        if path.suffix.lower() not in self.config.supported_extensions:
+            errors.append(f"Tipo de arquivo não suportado: {path.suffix}. Suportados: {self.config.supported_extensions}")
             return ValidationResult(False, errors, warnings)
         
-        if not path.is_file():
-            errors.append(f"Caminho não é um arquivo: {file_path}")
+        # A single stat answers existence, file type and size
+        try:
+            file_stat = path.stat()
+        except OSError:
+            errors.append(f"Arquivo não encontrado: {file_path}")
             return ValidationResult(False, errors, warnings)
         
-        # Check file extension
-        if path.suffix.lower() not in self.config.supported_extensions:
-            errors.append(f"Tipo de arquivo não suportado: {path.suffix}. Suportados: {self.config.supported_extensions}")
+        if not stat.S_ISREG(file_stat.st_mode):
+            errors.append(f"Caminho não é um arquivo: {file_path}")
             return ValidationResult(False, errors, warnings)
         
         # Check file size
-        file_size_mb = path.stat().st_size / (1024 * 1024)
+        file_size_mb = file_stat.st_size / (1024 * 1024)
         if file_size_mb > self.config.max_file_size_mb:
             warnings.append(f"Arquivo muito grande: {file_size_mb:.1f}MB (máximo recomendado: {self.config.max_file_size_mb}MB)")
         
@@ -129,7 +142,7 @@ class AssemblyCodeValidator:
             warnings.append("Código da montagem muito longo (máximo recomendado: 50 caracteres)")
         
         # Allow letters, numbers, and periods
-        if not re.match(r'^[A-Za-z0-9\.]+$', assembly_code):
+        if not _ASSEMBLY_CODE_PATTERN.fullmatch(assembly_code):
             errors.append("Código da montagem contém caracteres inválidos. Use apenas letras, números e ponto (.)")
             return ValidationResult(False, errors, warnings)
         
@@ -149,9 +162,11 @@ class AssemblyCodeValidator:
         if not text:
             return ""
         
+        text = str(text)
         # Keep only letters, numbers, and periods, convert to uppercase
-        sanitized = re.sub(r'[^A-Za-z0-9\.]', '', str(text)).upper()
-        return sanitized
+        if text.isascii():
+            return text.translate(_ASSEMBLY_CODE_DELETE_TABLE).upper()
+        return _INVALID_ASSEMBLY_CHARS_PATTERN.sub('', text).upper()
     
     def validate_assembly_code_input(self, text: str) -> Tuple[str, bool]:
         """
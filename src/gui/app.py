@@ -12,7 +12,6 @@ from typing import Optional
 
 from ..core.models import ConversionRequest
 from ..core.validators import AssemblyCodeValidator
-from ..core.converter import xlsx_to_parent_child_csv, MultiTypeConverter
 from ..core.conversion_types import ConversionType, get_conversion_types_for_gui
 
 
@@ -28,9 +27,9 @@ class SOLIDStructureGUI:
         self.root.geometry("700x900")
         self.root.resizable(False, False)
         
-        # Initialize validators and converters
+        # Initialize validators (the converter is created on first use, see multi_converter)
         self.assembly_validator = AssemblyCodeValidator()
-        self.multi_converter = MultiTypeConverter()
+        self._multi_converter = None
         
         # Initialize conversion type selection
         self.selected_conversion_type = ConversionType.HIERARCHICAL_STRUCTURE
@@ -85,6 +84,11 @@ class SOLIDStructureGUI:
         self.last_generated_file = None
         self.last_input_file_hash = None
         self.last_assembly_code = None
+        # Selected file: its (path, mtime, size) stamp is taken right away and its
+        # digest on a worker thread (see _track_file_hash)
+        self._hash_executor = None
+        self._file_hash_request = None
+        self._input_file_stamp = None
         self.conversion_completed = False
         self.current_output_file = None
         self.assembly_code_valid = False
@@ -103,6 +107,27 @@ class SOLIDStructureGUI:
 
         # Developer mode: auto-select example file and default assembly code for faster testing
         self._apply_dev_defaults()
+        
+        # Stop the file-hash worker together with the window
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _on_close(self):
+        """Close the window, dropping any pending file hash."""
+        try:
+            if self._hash_executor is not None:
+                self._hash_executor.shutdown(wait=False, cancel_futures=True)
+                self._hash_executor = None
+        except Exception as e:
+            print(f"Error stopping file hash worker: {e}")
+        self.root.destroy()
+    
+    @property
+    def multi_converter(self):
+        """Conversor criado sob demanda: pandas só é importado na primeira conversão."""
+        if self._multi_converter is None:
+            from ..core.converter import MultiTypeConverter
+            self._multi_converter = MultiTypeConverter()
+        return self._multi_converter
     
     def _set_window_icon(self):
         """Set the window icon."""
@@ -488,9 +513,7 @@ class SOLIDStructureGUI:
     
     def _update_status_for_conversion_type(self):
         """Update status indicator based on selected conversion type."""
-        from ..core.conversion_types import get_conversion_type_info
-        
-        type_info = get_conversion_type_info(self.selected_conversion_type)
+        type_info = self.selected_conversion_type.info
         
         if self.selected_input_file:
             if self.assembly_code_entry.get().strip():
@@ -637,22 +660,89 @@ class SOLIDStructureGUI:
                 return None
             
             hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+            # 1 MiB unbuffered reads: few Python-level iterations even for large workbooks
+            with open(file_path, "rb", buffering=0) as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
                     hash_md5.update(chunk)
             return hash_md5.hexdigest()
         except Exception as e:
             print(f"Error calculating file hash: {e}")
             return None
     
+    def _file_stamp(self, file_path: str):
+        """Cheap change marker of a file: (absolute path, mtime in ns, size); None if unreadable."""
+        try:
+            file_stat = os.stat(file_path)
+            return (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+        except OSError:
+            return None
+    
+    def _hash_in_background(self, file_path: str, on_done):
+        """Hash a file on the worker thread; on_done(stamp, digest) runs on the Tk thread."""
+        if self._hash_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._hash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-hash")
+        
+        stamp = self._file_stamp(file_path)
+        future = self._hash_executor.submit(self._calculate_file_hash, file_path)
+        
+        def poll():
+            # Tk is only touched from its own thread: poll the future from the event loop
+            try:
+                if not future.done():
+                    self.root.after(50, poll)
+                    return
+                on_done(stamp, future.result())
+            except Exception as e:
+                print(f"Error receiving file hash: {e}")
+        
+        self.root.after(50, poll)
+    
+    def _track_file_hash(self, file_path: str):
+        """Record the selected file's state: its stamp now, its digest off the Tk thread."""
+        try:
+            # The stat is cheap: a conversion started before the digest arrives
+            # is still compared against the file as it was tracked
+            self._file_hash_request = request = object()
+            self._input_file_stamp = self._file_stamp(file_path)
+            self.last_input_file_hash = None
+            
+            def store(stamp, digest):
+                # A newer selection/conversion replaces this request; a file touched
+                # between the stat and the hash is left to _input_file_changed
+                if request is self._file_hash_request and stamp == self._input_file_stamp:
+                    self.last_input_file_hash = digest
+            
+            self._hash_in_background(file_path, store)
+        except Exception as e:
+            print(f"Error scheduling file hash: {e}")
+    
+    def _input_file_changed(self) -> bool:
+        """Check the selected file by (mtime, size); a touched file is re-hashed in the background."""
+        stamp = self._file_stamp(self.selected_input_file)
+        if stamp is not None and stamp == self._input_file_stamp:
+            # Unchanged, whether or not its digest has arrived yet
+            return False
+        
+        if stamp is not None:
+            tracked_request = self._file_hash_request
+            
+            def confirm(new_stamp, digest):
+                # Same contents (e.g. saved without edits): the new stamp becomes the tracked one
+                if (tracked_request is self._file_hash_request and digest is not None
+                        and digest == self.last_input_file_hash):
+                    self._input_file_stamp = new_stamp
+            
+            self._hash_in_background(self.selected_input_file, confirm)
+        # Until the contents are confirmed, a touched (or missing) file counts as changed
+        return True
+    
     def _check_for_changes(self) -> bool:
         """Check if input file or assembly code has changed since last conversion."""
         try:
-            # Check if input file changed
-            if self.selected_input_file:
-                current_file_hash = self._calculate_file_hash(self.selected_input_file)
-                if current_file_hash != self.last_input_file_hash:
-                    return True
+            # Check if input file changed (no hashing on the Tk thread)
+            if self.selected_input_file and self._input_file_changed():
+                return True
             
             # Check if assembly code changed
             current_assembly_code = self.assembly_code_entry.get().strip()
@@ -685,12 +775,12 @@ class SOLIDStructureGUI:
         except Exception as e:
             print(f"Error resetting conversion state: {e}")
     
-    def _update_state_tracking(self):
-        """Update the state tracking variables."""
+    def _update_state_tracking(self, track_file: bool = True):
+        """Update the state tracking variables (track_file=False: assembly code only)."""
         try:
-            # Update file hash if file is selected
-            if self.selected_input_file:
-                self.last_input_file_hash = self._calculate_file_hash(self.selected_input_file)
+            # Update file hash if file is selected (off the Tk thread)
+            if track_file and self.selected_input_file:
+                self._track_file_hash(self.selected_input_file)
             
             # Update assembly code
             self.last_assembly_code = self.assembly_code_entry.get().strip()
@@ -729,7 +819,8 @@ class SOLIDStructureGUI:
             self._update_convert_button_state()
             
             # Do not reset conversion state while typing; just track changes
-            self._update_state_tracking()
+            # (typing does not touch the input file: no rehash per keystroke)
+            self._update_state_tracking(track_file=False)
         except Exception as e:
             print(f"Error in assembly code validation: {e}")
     
@@ -750,7 +841,7 @@ class SOLIDStructureGUI:
             # Update convert button state
             self._update_convert_button_state()
             # Track new value
-            self._update_state_tracking()
+            self._update_state_tracking(track_file=False)
         except Exception as e:
             print(f"Error in assembly code focus out: {e}")
     
@@ -1173,8 +1264,9 @@ class SOLIDStructureGUI:
         
         # Get file line count for realistic timing
         try:
-            import pandas as pd
-            df = pd.read_excel(input_file)
+            # Leitura em cache: a conversão logo abaixo reaproveita a planilha já lida
+            from ..core.excel_reader import read_excel_cached
+            df = read_excel_cached(input_file)
             line_count = len(df)
             # Calculate time: lines/100 seconds, minimum 2 seconds, maximum 10 seconds
             processing_time = max(2, min(10, line_count / 100))
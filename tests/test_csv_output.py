@@ -0,0 +1,83 @@
+"""
+Regressão do CSV hierárquico: CSVGenerator.save_csv_file deve gravar os mesmos
+bytes que a exportação anterior via DataFrame.to_csv.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.data_processor import CSVGenerator
+
+
+def reference_csv_bytes(output_rows) -> bytes:
+    """Exportação anterior: DataFrame de dicts gravado com to_csv após o cabeçalho."""
+    output_df = pd.DataFrame([
+        {'EMP': '001', 'MTG': parent_code, 'COD': child_code, 'QTD': quantity, 'PER': 0}
+        for parent_code, child_code, quantity in output_rows
+    ])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'reference.csv')
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            f.write('EMP;MTG;COD;QTD;PER\n')
+            output_df.to_csv(f, sep=';', index=False, header=False)
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+class TestSaveCsvFile(unittest.TestCase):
+
+    def saved_bytes(self, output_rows) -> bytes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ESTRUTURA_TESTE.csv')
+            CSVGenerator().save_csv_file(output_rows, path)
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def test_golden_integer_quantities(self):
+        rows = [('ABC', 'G0101', 2), ('G0101', 'Z01', 1), ('ABC', 'OL', np.int64(3))]
+        eol = os.linesep.encode()
+        expected = (
+            b'\xef\xbb\xbfEMP;MTG;COD;QTD;PER\n'
+            b'001;ABC;G0101;2;0' + eol +
+            b'001;G0101;Z01;1;0' + eol +
+            b'001;ABC;OL;3;0' + eol
+        )
+        self.assertEqual(self.saved_bytes(rows), expected)
+
+    def test_golden_float_quantities_and_quoting(self):
+        # One fractional quantity turns the whole column into floats; ';' and '"' are quoted
+        rows = [('ABC', 'G;01', 2), ('A"B', 'ÇÃO', 0.5), ('ABC', 'X', float('nan'))]
+        eol = os.linesep.encode()
+        expected = (
+            b'\xef\xbb\xbfEMP;MTG;COD;QTD;PER\n'
+            b'001;ABC;"G;01";2.0;0' + eol +
+            b'001;"A""B";\xc3\x87\xc3\x83O;0.5;0' + eol +
+            b'001;ABC;X;;0' + eol
+        )
+        self.assertEqual(self.saved_bytes(rows), expected)
+
+    def test_matches_dataframe_export(self):
+        rows_sets = [
+            [],
+            [('ABC', 'G0101', 2), ('G0101', 'Z01', 1)],
+            [('ABC', 'G0101', 2), ('ABC', 'G0102', 1.25), ('G0101', 'Z01', 1e-7), ('G0101', 'Z02', 12345678.9)],
+            [('A\nB', 'C\rD', 1), ('ABC', '', 4), ('ABC', 'Z 1', np.float64(2.0))],
+        ]
+        for rows in rows_sets:
+            self.assertEqual(self.saved_bytes(rows), reference_csv_bytes(rows), rows)
+
+    def test_large_output_crosses_flush_threshold(self):
+        rows = [(f'M{i % 97}', f'C{i}', (i % 7) + 1) for i in range(60000)]
+        self.assertEqual(self.saved_bytes(rows), reference_csv_bytes(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Regressão de excel_reader.read_excel_cached com leituras simultâneas: arquivos
+diferentes são lidos em paralelo e o mesmo arquivo é lido uma vez só.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import excel_reader
+
+
+class TestReadExcelCached(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.files = []
+        for name in ('LISTA.xlsx', 'CADASTRADOS.xlsx'):
+            path = os.path.join(self.directory.name, name)
+            with open(path, 'wb') as f:
+                f.write(name.encode())
+            self.files.append(path)
+        excel_reader._read_cache.clear()
+        self.addCleanup(excel_reader._read_cache.clear)
+
+    def read_in_threads(self, paths, fake_read) -> list:
+        results = [None] * len(paths)
+        errors = []
+
+        def read(position, path):
+            try:
+                results[position] = excel_reader.read_excel_cached(path)
+            except Exception as e:
+                errors.append(e)
+
+        with mock.patch.object(excel_reader, 'read_excel_file', side_effect=fake_read):
+            threads = [threading.Thread(target=read, args=(position, path)) for position, path in enumerate(paths)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+        self.assertEqual(errors, [])
+        return results
+
+    def test_different_files_are_parsed_concurrently(self):
+        # Each parse waits for the other one: serialized reads would break the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_read(path):
+            barrier.wait()
+            return pd.DataFrame({'ITEM': [os.path.basename(path)]})
+
+        results = self.read_in_threads(self.files, fake_read)
+        self.assertEqual([df['ITEM'].tolist() for df in results], [['LISTA.xlsx'], ['CADASTRADOS.xlsx']])
+        self.assertEqual(excel_reader._key_locks, {})
+
+    def test_same_file_is_parsed_once(self):
+        calls = []
+
+        def fake_read(path):
+            calls.append(path)
+            # Give the other readers time to queue up on the same file
+            threading.Event().wait(0.2)
+            return pd.DataFrame({'ITEM': ['1']})
+
+        results = self.read_in_threads([self.files[0]] * 3, fake_read)
+        self.assertEqual(calls, [self.files[0]])
+        self.assertEqual([df['ITEM'].tolist() for df in results], [['1']] * 3)
+        self.assertEqual(len({id(df) for df in results}), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Regressão de excel_reader._with_text_columns: com N° DESENHO / CODIGO MP20 como
+strings (pd.NA nas células vazias), todos os conversores devem gerar os mesmos
+arquivos e mensagens que com as colunas lidas como object. Inclui uma planilha
+com a coluna N° DESENHO inteira vazia.
+"""
+
+import os
+import sys
+import tempfile
+import importlib.util
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core import excel_reader
+from src.core.models import ConversionRequest
+from src.core.converter import MultiTypeConverter, _conversion_cache
+from src.core.conversion_types import ConversionType
+from src.core.converters import olz_verification_converter
+from src.core.data_processor import DataProcessor
+
+HEADER = ['ITEM', 'QTD', 'DESCRIÇÃO', 'N° DESENHO', 'MATÉRIA PRIMA', 'CODIGO MP20', 'MATERIAL', 'PESO']
+ROWS = [
+    ['1', 1, 'GUINDASTE', 'OLG08H2M2', None, None, None, 1442.67],
+    ['1.1', 1, 'BASE', 'OLG08-10-0200', None, None, None, 382.11],
+    ['1.1.1', 2, 'VIGA 1950mm', 'OLG08-10-0220', 'CHAPA', '500002 - CHAPA STRENX', 'STRENX', 44.38],
+    ['1.1.2', 1, 'SEM DESENHO', None, 'CHAPA', '500009 - CHAPA', 'STRENX', 16.24],
+    ['1.1.3', 1, 'SEM MATERIAL', 'OLG08-10-0224', 'CHAPA', None, None, None],
+    ['1.1.4', 3, 'DESENHO NUMERICO', 1234567, 'TUBO', 500037, 'A36', '3,19'],
+    ['1.1.5', 1, 'PECA OLZ', 'OLZ-03058-032', None, 'Z20001', None, 0.5],
+    ['1.1.6', 1, 'OLZ SEM CADASTRO', 'OLZ 99-1', None, 'z 200012 - q', None, None],
+    ['1.1.7', 1, 'IGNORADA', 'OLG08^10', None, '500002', None, 1],
+    [None, 1, 'ITEM VAZIO', 'OLG08-10-0230', None, None, None, 2],
+    ['1.2', 1.5, 'FRACIONADA', 'OLG08-10-0300', 'BARRA 1200 MM', '500100 - BARRA', 'SAE', 7.25],
+    ['1.2.1', 1, 'FILHA', 'OLG08-10-0301', None, '  ', None, 'abc'],
+]
+CONVERSION_TYPES = [
+    ConversionType.HIERARCHICAL_STRUCTURE,
+    ConversionType.PARTS_REGISTRATION,
+    ConversionType.DESCRIPTION_UPDATE,
+    ConversionType.MATERIAL_UPDATE,
+    ConversionType.OLZ_VERIFICATION,
+]
+BLANK_DRAWING_ROWS = [row[:3] + [None] + row[4:] for row in ROWS]
+
+
+def write_workbook(path: str, rows: list):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+class TestTextColumns(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.input_file = os.path.join(cls.directory.name, 'LISTA.xlsx')
+        write_workbook(cls.input_file, ROWS)
+        cls.blank_drawing_file = os.path.join(cls.directory.name, 'LISTA_SEM_DESENHO.xlsx')
+        write_workbook(cls.blank_drawing_file, BLANK_DRAWING_ROWS)
+
+        cls.reference_file = os.path.join(cls.directory.name, 'CADASTRADOS.csv')
+        with open(cls.reference_file, 'w', encoding='utf-8-sig') as f:
+            f.write('CODIGO;DESC\nZ03058032;a\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def run_conversions(self, text_dtype, input_file: str = None) -> dict:
+        """Run every conversion with the given text dtype; returns messages and output files."""
+        input_file = input_file or self.input_file
+        output_dir = tempfile.mkdtemp(dir=self.directory.name)
+        excel_reader._read_cache.clear()
+        _conversion_cache.clear()
+        olz_verification_converter._reference_cache.clear()
+
+        environment = {
+            'SOLID_OUTPUT_DIR': output_dir,
+            'SOLID_SKIP_INPUT_COPY': '1',
+            'SOLID_OLZ_REFERENCE_FILE': self.reference_file,
+        }
+        outputs = {}
+        with mock.patch.object(excel_reader, '_TEXT_DTYPE', text_dtype), mock.patch.dict(os.environ, environment):
+            converter = MultiTypeConverter()
+            for conversion_type in CONVERSION_TYPES:
+                request = ConversionRequest(input_file, os.path.join(output_dir, 'ESTRUTURA_TESTE.csv'), 'TESTE')
+                result = converter.convert(request, conversion_type)
+                self.assertTrue(result.success, result.message)
+                outputs[conversion_type] = result.message.replace(output_dir, '<DIR>')
+        for name in sorted(os.listdir(output_dir)):
+            with open(os.path.join(output_dir, name), 'rb') as f:
+                outputs[name] = f.read()
+        return outputs
+
+    def assert_same_outputs(self, text_dtype):
+        expected = self.run_conversions(None)
+        self.assertIn('RELATORIO_REMOVIDOS_TESTE.csv', expected)
+        self.assertEqual(self.run_conversions(text_dtype), expected)
+
+    def test_python_strings_match_object_columns(self):
+        self.assert_same_outputs('string')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow não instalado')
+    def test_arrow_strings_match_object_columns(self):
+        self.assert_same_outputs('string[pyarrow]')
+
+    def test_cast_keeps_missing_cells_missing(self):
+        with mock.patch.object(excel_reader, '_TEXT_DTYPE', 'string'):
+            df = excel_reader._with_text_columns(excel_reader.read_excel_file(self.input_file))
+        self.assertEqual(df['N° DESENHO'].isna().tolist(), [row[3] is None for row in ROWS])
+        self.assertEqual(df['N° DESENHO'].iloc[5], '1234567')
+        self.assertEqual(df['CODIGO MP20'].iloc[5], '500037')
+
+    def test_blank_drawing_column_excludes_every_row(self):
+        for text_dtype in (None, 'string'):
+            with mock.patch.object(excel_reader, '_TEXT_DTYPE', text_dtype):
+                df = excel_reader._with_text_columns(excel_reader.read_excel_file(self.blank_drawing_file))
+            with self.assertNoLogs('src.core.data_processor', level='WARNING'):
+                items_by_level, item_to_code, exclusion_records, stats = DataProcessor().process_excel_data(df)
+            self.assertEqual((items_by_level, item_to_code), ({}, {}))
+            self.assertEqual((stats.valid_rows, stats.excluded_rows), (0, len(ROWS)))
+            self.assertEqual({record['MOTIVO'] for record in exclusion_records},
+                             {'N° DESENHO inválido ou ausente (sem código convertido)'})
+
+    def test_blank_drawing_column_converts_with_every_type(self):
+        expected = self.run_conversions(None, self.blank_drawing_file)
+        self.assertEqual(expected['ESTRUTURA_TESTE.csv'], b'\xef\xbb\xbfEMP;MTG;COD;QTD;PER\n')
+        self.assertEqual(self.run_conversions('string', self.blank_drawing_file), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Regressão das rotinas vetorizadas: cada uma deve dar o mesmo resultado que a
+versão célula a célula que substituiu.
+"""
+
+import datetime
+import logging
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.data_processor import OLGCodeConverter, HierarchyLevelParser, DataProcessor
+from src.core.converters.base_converter import BaseConverter
+from src.core.converters.material_update_converter import MaterialUpdateConverter
+from src.core.converters.parts_registration_converter import PartsRegistrationConverter
+
+
+def reference_format_material_code(raw) -> str:
+    """Versão por célula de MaterialUpdateConverter._format_material_codes."""
+    if raw is None:
+        return ""
+    s = str(raw).strip().upper()
+    if ' - ' in s:
+        s = s.split(' - ', 1)[0].strip()
+    if not s:
+        return ""
+    digits = ''.join(re.findall(r'\d', s))
+    if s.startswith('Z'):
+        if len(digits) >= 6:
+            return 'Z' + digits[-6:]
+        if len(digits) >= 5:
+            return 'Z' + digits[-5:]
+        return ''
+    if len(digits) >= 6:
+        return digits[-6:]
+    return ''
+
+
+def reference_format_weight(text: str) -> str:
+    """Versão por célula de PartsRegistrationConverter._format_weights."""
+    try:
+        txt = str(text).strip()
+        txt = txt.replace('\u00A0', ' ').replace(' ', '')
+        txt = txt.replace(',', '.')
+        formatted = f"{float(txt):.2f}".rstrip('0').rstrip('.')
+        return formatted if formatted != '' else '0'
+    except Exception:
+        return '0'
+
+
+def random_text(rng: random.Random, alphabet, max_length: int) -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+class TestConvertOlgCodes(unittest.TestCase):
+    """convert_olg_codes x convert_olg_code."""
+
+    ALPHABET = ['O', 'L', 'OL', 'G', 'Z', '-', ' ', '1', '2', 'é', '_', '^', '\t', 'ß', '9' * 30]
+
+    def setUp(self):
+        self.converter = OLGCodeConverter()
+
+    def random_value(self, rng: random.Random):
+        k = rng.random()
+        if k < 0.1:
+            return None
+        if k < 0.15:
+            return np.nan
+        if k < 0.25:
+            return rng.randint(0, 10 ** 6)
+        if k < 0.3:
+            return rng.random() * 100
+        if k < 0.32:
+            return datetime.datetime(2020, 1, rng.randint(1, 28))
+        if k < 0.34:
+            return True
+        return random_text(rng, self.ALPHABET, 8)
+
+    def test_matches_scalar_conversion(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            values = [self.random_value(rng) for _ in range(rng.randint(0, 60))]
+            column = pd.Series(values, dtype=object)
+            expected = [self.converter.convert_olg_code(value) for value in values]
+            self.assertEqual(self.converter.convert_olg_codes(column).tolist(), expected, values)
+
+    def test_numeric_column_keeps_text_form(self):
+        # 1 and 1.0 are different texts ('1' / '1.0'): not merged by the dedup
+        column = pd.Series([1, 1.0, 1.5, np.nan], dtype=object)
+        expected = [self.converter.convert_olg_code(value) for value in column.tolist()]
+        self.assertEqual(self.converter.convert_olg_codes(column).tolist(), expected)
+
+    def test_missing_values(self):
+        # Blank cells must not pick up a code from another row
+        self.assertEqual(self.converter.convert_olg_codes(pd.Series([None, np.nan], dtype=object)).tolist(), [None, None])
+        self.assertEqual(self.converter.convert_olg_codes(pd.Series([np.nan, np.nan])).tolist(), [None, None])
+        self.assertEqual(self.converter.convert_olg_codes(pd.Series([], dtype=object)).tolist(), [])
+        column = pd.Series([None, 'OLG-01', np.nan, 'OLG-02'], dtype=object)
+        self.assertEqual(self.converter.convert_olg_codes(column).tolist(), [None, 'G01', None, 'G02'])
+
+    def test_keeps_index(self):
+        column = pd.Series(['OLG-01', None], index=[10, 20])
+        result = self.converter.convert_olg_codes(column)
+        self.assertEqual(result.index.tolist(), [10, 20])
+        self.assertEqual(result.tolist(), ['G01', None])
+
+
+class TestParseHierarchyLevels(unittest.TestCase):
+    """parse_hierarchy_levels x parse_hierarchy_level (níveis e avisos)."""
+
+    def warnings_of(self, logger, call):
+        with self.assertLogs(logger, level='DEBUG') as captured:
+            logger.debug('início')
+            result = call()
+        return result, {record.getMessage() for record in captured.records if record.levelno >= logging.WARNING}
+
+    def test_matches_scalar_parser(self):
+        parser = HierarchyLevelParser()
+        rng = random.Random(1)
+        for _ in range(300):
+            items = [random_text(rng, '0123456789. a\t', 25).strip() for _ in range(30)]
+            items += ['1' + '.1' * 12, '1 2.3', '1.0', '2. 0']
+            expected, expected_warnings = self.warnings_of(
+                parser.logger, lambda: [parser.parse_hierarchy_level(item) for item in items])
+            levels, warnings = self.warnings_of(parser.logger, lambda: parser.parse_hierarchy_levels(items))
+            self.assertEqual(levels.tolist(), expected, items)
+            self.assertEqual(warnings, expected_warnings, items)
+
+    def test_process_excel_data_warns_only_for_rows_reaching_level_check(self):
+        # Rows dropped for '^' or a missing code never had their ITEM parsed
+        df = pd.DataFrame({
+            'ITEM': ['x1', 'x2', 'x3', '1'],
+            'QTD': [1, 1, 1, 1],
+            'N° DESENHO': ['OLG^01', None, 'OLG-01', 'OLG-02'],
+            'CODIGO MP20': [None] * 4,
+        })
+        processor = DataProcessor()
+        _, warnings = self.warnings_of(processor.hierarchy_parser.logger, lambda: processor.process_excel_data(df))
+        self.assertEqual(warnings, {"Formato de item inválido: 'x3' (contém caracteres não numéricos)"})
+
+
+class TestFormatMaterialCodes(unittest.TestCase):
+    """_format_material_codes x formatação por célula."""
+
+    ALPHABET = list('Zz0123456789 -;\t\r\n\xa0\x0b٣１ßabAB.,') + [' - ', '  ']
+
+    def test_matches_scalar_format(self):
+        rng = random.Random(0)
+        values = [random_text(rng, self.ALPHABET, 14) for _ in range(20000)]
+        values += [None, np.nan, 1234567, 12.5, pd.NaT, 'ﬀ', 'Z20001', 'z 200012 - q', 'Ｚ123456']
+        texts = BaseConverter.column_as_text(pd.Series(values, dtype=object))
+        expected = [reference_format_material_code(text) for text in texts.tolist()]
+        self.assertEqual(MaterialUpdateConverter._format_material_codes(texts).tolist(), expected)
+
+    def test_empty_column(self):
+        self.assertEqual(MaterialUpdateConverter._format_material_codes(pd.Series([], dtype=object)).tolist(), [])
+
+
+class TestFormatWeights(unittest.TestCase):
+    """_format_weights x formatação por célula."""
+
+    def test_matches_scalar_format(self):
+        rng = random.Random(2)
+        values = [random_text(rng, list('0123456789,. -e\xa0') + ['nan', 'inf', 'abc'], 8) for _ in range(20000)]
+        values += [1, 2.5, np.nan, None, '3,5', ' 4 ', '1 000,5', 0, -1.25, '', 'nan', 1e-7, 12.345]
+        texts = BaseConverter.column_as_text(pd.Series(values, dtype=object))
+        expected = [reference_format_weight(text) for text in texts.tolist()]
+        self.assertEqual(PartsRegistrationConverter._format_weights(texts), expected)
+
+
+class TestSanitizeTextColumn(unittest.TestCase):
+    """sanitize_text_column x _sanitize_field."""
+
+    ALPHABET = list('ab ;\t\r\n\xa0\x0b') + ['  ', 'Ç']
+
+    def test_matches_scalar_sanitize(self):
+        rng = random.Random(3)
+        values = [random_text(rng, self.ALPHABET, 14) for _ in range(20000)] + [None, np.nan, 42, 3.5]
+        texts = BaseConverter.column_as_text(pd.Series(values, dtype=object))
+        expected = [BaseConverter._sanitize_field(text) for text in texts.tolist()]
+        self.assertEqual(BaseConverter.sanitize_text_column(texts).tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()